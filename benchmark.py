@@ -0,0 +1,175 @@
+"""
+Throughput benchmark: runs ``run_main_process`` end to end against the local docpub stand-in.
+
+For every roster size and worker count a synthetic roster is written, looked up in a fresh
+process and timed. The report gives rows per minute, peak RSS of the run and the p50/p95 of
+each lookup stage, so changes to the search, executor or output path can be compared.
+
+Example::
+
+    python benchmark.py --sizes 100,1000 --workers 1,3,8 --latency 0.05 --error-rate 0.01
+    python benchmark.py --backend selenium --workers 4,8 --tabs-per-browser 4
+
+Peak RSS covers the Python process only; Chrome and chromedriver run as separate processes
+with the Selenium backend.
+"""
+import argparse
+import contextlib
+import csv
+import json
+import multiprocessing
+import os
+import queue
+import sys
+import tempfile
+import time
+
+try:
+    import resource  # Unix only
+except ImportError:
+    resource = None
+
+try:
+    import psutil  # Optional: peak working set on Windows
+except ImportError:
+    psutil = None
+
+from docpub_standin import start_standin
+from main import BACKEND_HTTP, BACKEND_SELENIUM, run_main_process
+
+# Synthetic SID numbers start here; every one is eight digits like a real DOC number
+FIRST_SYNTHETIC_SID = 10000000
+
+# Stages shown in the printed report (all stages are kept in the JSON report)
+REPORT_STAGES = ["navigate", "submit", "result_wait", "extract", "lookup"]
+
+
+def synthetic_offenders(size, found_fraction=0.8):
+    """Offenders for the first ``found_fraction`` of a roster of ``size`` synthetic SID numbers."""
+    offenders = {}
+    for i in range(int(size * found_fraction)):
+        sid = str(FIRST_SYNTHETIC_SID + i)
+        offenders[sid] = {"name": f"SYNTHETIC, OFFENDER {i}", "location": f"Institution {i % 14}",
+                          "status": "Inmate", "release_date": "01/01/2030"}
+    return offenders
+
+
+def write_synthetic_roster(path, size):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        roster = csv.writer(f)
+        roster.writerow(["Last Name", "Fist Name", "DOC Number", "Previous Location", "Notes"])
+        for i in range(size):
+            roster.writerow([f"Last{i}", f"First{i}", FIRST_SYNTHETIC_SID + i, "", ""])
+
+
+def peak_rss_mb():
+    """Peak resident memory of this process in MB, or None when it cannot be read."""
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024  # bytes on macOS, KB elsewhere
+    if psutil is not None:
+        memory = psutil.Process().memory_info()
+        return getattr(memory, "peak_wset", memory.rss) / (1024 * 1024)
+    return None
+
+
+def _run_case(results, roster_path, output_path, options):
+    # Runs in a fresh process so peak RSS belongs to this case alone
+    # Per-row progress messages would swamp the report
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        run_main_process(roster_path, output_path, lambda: False, **options)
+        elapsed = time.perf_counter() - start
+
+    with open(output_path + ".metrics.json", "r", encoding="utf-8") as f:
+        metrics = json.load(f)
+    results.put({"elapsed_seconds": elapsed, "peak_rss_mb": peak_rss_mb(), "stages": metrics["stages"]})
+
+
+def run_case(size, workers, work_dir, base_url, backend=BACKEND_HTTP, processes=None, tabs_per_browser=None):
+    """Look up a synthetic roster of ``size`` rows with ``workers`` workers and return its measurements."""
+    roster_path = os.path.join(work_dir, f"roster_{size}.csv")
+    if not os.path.exists(roster_path):
+        write_synthetic_roster(roster_path, size)
+    output_path = os.path.join(work_dir, f"output_{size}_{workers}.csv")
+
+    # A fixed worker count, no cache and no rate limit, so the numbers reflect the lookup path itself
+    options = {"backend": backend, "base_url": base_url, "use_cache": False, "workers": workers,
+               "max_workers": workers, "adaptive_concurrency": False, "rate_limit": None, "processes": processes,
+               "tabs_per_browser": tabs_per_browser}
+    results = multiprocessing.Queue()
+    case = multiprocessing.Process(target=_run_case, args=(results, roster_path, output_path, options))
+    case.start()
+    measurement = None
+    while measurement is None:
+        try:
+            measurement = results.get(timeout=1)
+        except queue.Empty:
+            if not case.is_alive():
+                raise RuntimeError(f"Benchmark run for {size} rows with {workers} workers exited with code {case.exitcode}")
+    case.join()
+
+    measurement.update(size=size, workers=workers, rows_per_minute=size / (measurement["elapsed_seconds"] / 60))
+    return measurement
+
+
+def format_report(measurements):
+    lines = [f"{'rows':>7} {'workers':>7} {'rows/min':>10} {'peak RSS':>9}  "
+             + "  ".join(f"{stage + ' p50/p95':>22}" for stage in REPORT_STAGES)]
+    for m in measurements:
+        rss = "n/a" if m["peak_rss_mb"] is None else f"{m['peak_rss_mb']:.0f} MB"
+        stages = []
+        for stage in REPORT_STAGES:
+            stats = m["stages"].get(stage)
+            cell = "-" if stats is None else f"{stats['p50']:.3f}s/{stats['p95']:.3f}s"
+            stages.append(f"{cell:>22}")
+        lines.append(f"{m['size']:>7} {m['workers']:>7} {m['rows_per_minute']:>10.0f} {rss:>9}  " + "  ".join(stages))
+    return "\n".join(lines)
+
+
+def _int_list(text):
+    return [int(value) for value in text.split(",") if value.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark lookups end to end against the docpub stand-in.")
+    parser.add_argument("--sizes", type=_int_list, default=[100, 1000], help="roster sizes, comma separated")
+    parser.add_argument("--workers", type=_int_list, default=[1, 3, 8], help="worker counts, comma separated")
+    parser.add_argument("--backend", choices=[BACKEND_HTTP, BACKEND_SELENIUM], default=BACKEND_HTTP)
+    parser.add_argument("--processes", type=int, default=None, help="run lookups in this many worker processes")
+    parser.add_argument("--tabs-per-browser", type=int, default=None,
+                        help="with the selenium backend, give workers tabs in shared browsers, this many per browser")
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds the stand-in delays every response")
+    parser.add_argument("--jitter", type=float, default=0.02, help="up to this many further seconds per response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests failed with a 503")
+    parser.add_argument("--found-fraction", type=float, default=0.8, help="fraction of the roster that is found")
+    parser.add_argument("--seed", type=int, default=1, help="seed for the stand-in's latency and error draws")
+    parser.add_argument("--report", help="also write the measurements to this JSON file")
+    args = parser.parse_args()
+
+    server, base_url = start_standin(offenders=synthetic_offenders(max(args.sizes), args.found_fraction),
+                                     latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                                     seed=args.seed)
+    measurements = []
+    try:
+        with tempfile.TemporaryDirectory(prefix="ojrc_benchmark_") as work_dir:
+            for size in args.sizes:
+                for workers in args.workers:
+                    print(f"Benchmarking {size} rows with {workers} workers...")
+                    measurements.append(run_case(size, workers, work_dir, base_url, args.backend, args.processes,
+                                                        args.tabs_per_browser))
+    finally:
+        server.shutdown()
+
+    print()
+    print(f"Stand-in latency {args.latency}s + up to {args.jitter}s, error rate {args.error_rate:.1%}, "
+          f"{server.state.injected_errors} of {server.state.requests} requests failed")
+    print(format_report(measurements))
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(measurements, f, indent=2)
+        print(f"Measurements written to {args.report}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+import threading
+import time
+
+
+class CancellationToken:
+    """
+    Stop signal for a run that can be passed anywhere a ``stop_flag`` callable is expected.
+
+    Calling the token returns True once :meth:`cancel` has been called. Unlike a plain flag it can
+    also be waited on, so sleeps between retries end as soon as the run is stopped.
+    """
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+
+    def __call__(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def wait(self, timeout=None) -> bool:
+        """Block for up to ``timeout`` seconds; returns True if the token was cancelled."""
+        return self._event.wait(timeout)
+
+
+def sleep_unless_stopped(stop_flag, seconds, poll_interval=0.1):
+    """
+    Sleep for ``seconds`` or until ``stop_flag()`` is true, whichever comes first.
+
+    Uses the flag's own ``wait`` when it has one (a :class:`CancellationToken` or ``threading.Event``),
+    otherwise polls it. Returns True if the run was stopped.
+    """
+    wait = getattr(stop_flag, "wait", None)
+    if wait is not None:
+        return bool(wait(seconds))
+
+    deadline = time.monotonic() + seconds
+    while not stop_flag():
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        time.sleep(min(poll_interval, remaining))
+    return True
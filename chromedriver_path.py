@@ -0,0 +1,112 @@
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+
+# Manifest that remembers the resolved chromedriver between runs
+MANIFEST_PATH = os.path.join(os.path.expanduser("~"), ".ojrc", "chromedriver_manifest.json")
+
+# Environment overrides for machines without network access
+OFFLINE_ENV = "OJRC_OFFLINE"
+PINNED_DRIVER_ENV = "OJRC_CHROMEDRIVER"
+
+_resolved_path = None
+_resolved_from_manifest = False
+_lock = threading.Lock()
+
+
+def _offline_requested(offline):
+    if offline is not None:
+        return offline
+    return os.environ.get(OFFLINE_ENV, "").strip().lower() in ("1", "true", "yes")
+
+
+def _read_manifest():
+    try:
+        with open(MANIFEST_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_manifest(manifest):
+    try:
+        os.makedirs(os.path.dirname(MANIFEST_PATH), exist_ok=True)
+        tmp_path = MANIFEST_PATH + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, MANIFEST_PATH)
+    except OSError as e:
+        logging.error(f"Error writing chromedriver manifest: {e}")
+
+
+def resolve_chromedriver_path(offline=None, pinned_path=None):
+    """
+    Return the chromedriver executable path, resolving it at most once per process.
+
+    Online, a path recorded in the on-disk manifest is reused as long as the file still exists;
+    only when it is missing is ``ChromeDriverManager().install()`` called, and its answer is saved
+    back to the manifest. Offline, webdriver_manager is never touched and the pinned driver from
+    ``pinned_path``, the ``OJRC_CHROMEDRIVER`` environment variable or the manifest's ``pinned`` entry
+    is used instead.
+
+    :raises FileNotFoundError: if offline mode is requested and no pinned chromedriver exists
+    """
+    global _resolved_path, _resolved_from_manifest
+
+    with _lock:
+        if _resolved_path is not None:
+            return _resolved_path
+
+        manifest = _read_manifest()
+
+        if _offline_requested(offline):
+            path = pinned_path or os.environ.get(PINNED_DRIVER_ENV) or manifest.get("pinned")
+            if not path or not os.path.isfile(path):
+                raise FileNotFoundError(
+                    f"Offline mode requires a pinned chromedriver. Set {PINNED_DRIVER_ENV} or the "
+                    f"'pinned' entry in {MANIFEST_PATH}.")
+            logging.info(f"Using pinned chromedriver (offline mode): {path}")
+            _resolved_path = path
+            _resolved_from_manifest = False
+            return _resolved_path
+
+        path = manifest.get("path")
+        if path and os.path.isfile(path):
+            logging.info(f"Using chromedriver from manifest: {path}")
+            _resolved_path = path
+            _resolved_from_manifest = True
+            return _resolved_path
+
+        # Imported lazily so offline machines never need webdriver_manager to do any I/O
+        from webdriver_manager.chrome import ChromeDriverManager
+
+        path = ChromeDriverManager().install()
+        manifest["path"] = path
+        manifest["resolved_at"] = datetime.now().isoformat(timespec="seconds")
+        _write_manifest(manifest)
+        logging.info(f"Resolved chromedriver with webdriver_manager: {path}")
+        _resolved_path = path
+        _resolved_from_manifest = False
+        return _resolved_path
+
+
+def invalidate_chromedriver_path():
+    """
+    Forget a manifest-cached driver path, e.g. after Chrome was upgraded past it.
+
+    Returns True if the cached path came from the manifest and a fresh resolve may help.
+    """
+    global _resolved_path, _resolved_from_manifest
+
+    with _lock:
+        if not _resolved_from_manifest:
+            return False
+        manifest = _read_manifest()
+        manifest.pop("path", None)
+        manifest.pop("resolved_at", None)
+        _write_manifest(manifest)
+        _resolved_path = None
+        _resolved_from_manifest = False
+        return True
@@ -0,0 +1,174 @@
+import logging
+import os
+import statistics
+import threading
+import time
+
+try:
+    import psutil  # In requirements.txt; the fallback below reads nothing on Windows
+except ImportError:
+    psutil = None
+
+# Never run more concurrent lookups than this against the remote site
+POLITE_MAX_WORKERS = 8
+
+# Host limits above which concurrency is lowered
+MAX_CPU_PERCENT = 85.0
+MAX_MEMORY_PERCENT = 85.0
+
+
+def host_headroom():
+    """
+    Return ``(cpu_percent, memory_percent)`` for the host; either is None when it cannot be read.
+
+    Uses psutil when installed, otherwise the load average and /proc/meminfo where available.
+    """
+    if psutil is not None:
+        return psutil.cpu_percent(interval=None), psutil.virtual_memory().percent
+
+    cpu = None
+    if hasattr(os, "getloadavg"):
+        cpu = 100.0 * os.getloadavg()[0] / (os.cpu_count() or 1)
+
+    memory = None
+    try:
+        meminfo = {}
+        with open("/proc/meminfo", "r") as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                meminfo[key] = int(value.split()[0])
+        memory = 100.0 * (1 - meminfo["MemAvailable"] / meminfo["MemTotal"])
+    except (OSError, KeyError, ValueError):
+        pass
+    return cpu, memory
+
+
+class AdaptiveConcurrency:
+    """
+    Chooses how many lookups run at once from what the lookups and the host report.
+
+    Every ``sample_size`` completed lookups the controller looks at the error and timeout rates,
+    the median latency against a decaying baseline of recent medians, and host CPU and memory use. It backs
+    off multiplicatively when lookups fail, slow down or the host is short of headroom, and adds
+    one worker at a time otherwise, never leaving ``[min_workers, max_workers]``.
+    """
+
+    def __init__(self, initial: int = 3, min_workers: int = 1, max_workers: int = POLITE_MAX_WORKERS,
+                 sample_size: int = 10, max_error_rate: float = 0.1, max_slowdown: float = 1.5,
+                 min_slowdown_seconds: float = 0.5, baseline_decay: float = 0.2) -> None:
+        """
+        :param initial: starting concurrency
+        :param min_workers: lowest concurrency the controller will drop to
+        :param max_workers: polite ceiling for the remote site
+        :param sample_size: completed lookups between adjustments
+        :param max_error_rate: error plus timeout rate above which concurrency is halved
+        :param max_slowdown: median latency, relative to the baseline, above which concurrency is lowered
+        :param min_slowdown_seconds: how many seconds the median must also exceed the baseline by, so the
+            normal spread between found and not-found lookups does not count as slowing down
+        :param baseline_decay: weight of each new median in the baseline (an exponential moving average)
+        """
+        self.min_workers = max(1, min_workers)
+        self.max_workers = max(self.min_workers, max_workers)
+        self.limit = min(max(initial, self.min_workers), self.max_workers)
+        self.sample_size = sample_size
+        self.max_error_rate = max_error_rate
+        self.max_slowdown = max_slowdown
+        self.min_slowdown_seconds = min_slowdown_seconds
+        self.baseline_decay = baseline_decay
+        self.history = [(time.time(), self.limit, "initial")]
+
+        self._lock = threading.Lock()
+        self._latencies = []
+        self._errors = 0
+        self._timeouts = 0
+        self._baseline = None
+
+        if psutil is not None:
+            psutil.cpu_percent(interval=None)  # Prime the counter; the first reading is meaningless
+
+    def record_error(self, timed_out: bool = False) -> None:
+        """Count a failed lookup attempt (called from worker threads)."""
+        with self._lock:
+            if timed_out:
+                self._timeouts += 1
+            else:
+                self._errors += 1
+
+    def record_errors(self, errors: int, timeouts: int) -> None:
+        """Count failed attempts reported in bulk, e.g. by a worker process."""
+        with self._lock:
+            self._errors += errors
+            self._timeouts += timeouts
+
+    def record(self, latency: float) -> int:
+        """Record one completed lookup and return the (possibly adjusted) concurrency limit."""
+        with self._lock:
+            self._latencies.append(latency)
+            if len(self._latencies) < self.sample_size:
+                return self.limit
+
+            latencies, self._latencies = self._latencies, []
+            errors, self._errors = self._errors, 0
+            timeouts, self._timeouts = self._timeouts, 0
+
+        median = statistics.median(latencies)
+        failure_rate = (errors + timeouts) / (len(latencies) + errors + timeouts)
+        cpu, memory = host_headroom()
+        baseline = median if self._baseline is None else self._baseline
+        slowing_down = median > baseline * self.max_slowdown and median - baseline > self.min_slowdown_seconds
+        # The baseline follows recent medians, so a lasting change in the site's speed becomes the new normal
+        self._baseline = baseline + self.baseline_decay * (median - baseline)
+
+        if failure_rate > self.max_error_rate:
+            new_limit, reason = self.limit // 2, f"{errors} errors and {timeouts} timeouts"
+        elif (cpu is not None and cpu > MAX_CPU_PERCENT) or (memory is not None and memory > MAX_MEMORY_PERCENT):
+            new_limit, reason = self.limit - 1, "host short of CPU or memory"
+        elif slowing_down:
+            new_limit, reason = self.limit - 1, "lookups slowing down"
+        else:
+            new_limit, reason = self.limit + 1, "healthy"
+        new_limit = min(max(new_limit, self.min_workers), self.max_workers)
+
+        if new_limit != self.limit:
+            message = (f"Concurrency {self.limit} -> {new_limit} ({reason}; median lookup {median:.2f}s, "
+                       f"failure rate {failure_rate:.0%}, cpu {self._percent(cpu)}, memory {self._percent(memory)})")
+            logging.info(message)
+            print(message)
+            self.limit = new_limit
+            self.history.append((time.time(), new_limit, reason))
+        return self.limit
+
+    @staticmethod
+    def _percent(value):
+        return "n/a" if value is None else f"{value:.0f}%"
+
+    def summary(self):
+        start = self.history[0][0]
+        steps = ", ".join(f"{int(t - start)}s: {limit}" for t, limit, _ in self.history)
+        return f"Concurrency over time: {steps}"
+
+
+class ErrorTally:
+    """
+    Stand-in for :class:`AdaptiveConcurrency` inside a worker process: counts failed attempts so they
+    can be sent to the coordinator's controller with the next result.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._errors = 0
+        self._timeouts = 0
+
+    def record_error(self, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self._timeouts += 1
+            else:
+                self._errors += 1
+
+    def drain(self):
+        """Return and reset ``(errors, timeouts)``."""
+        with self._lock:
+            counts = (self._errors, self._timeouts)
+            self._errors = self._timeouts = 0
+        return counts
@@ -0,0 +1,258 @@
+"""
+Local stand-in for the docpub offender search, serving fixture pages.
+
+Mimics the pieces of ``searchCriteria.jsf`` the lookup code touches: the disclaimer form, the
+``mainBodyForm`` SID search, the DOC number command link and the ``offensesForm`` detail page.
+Every response can be delayed and a fraction of them failed with a 503, to see how lookups
+behave against a slow or flaky site.
+
+Run it with ``python docpub_standin.py --port 8765`` and point the app at it with
+``OJRC_DOCPUB_URL=http://127.0.0.1:8765/OOS``.
+"""
+import argparse
+import html
+import random
+import secrets
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+APP_PATH = "/OOS"
+
+# Fixture offenders keyed by SID number (no leading zeros)
+FIXTURE_OFFENDERS = {
+    "12345678": {"name": "DOE, JOHN", "location": "Snake River Correctional Institution",
+                 "status": "Inmate", "release_date": "03/14/2027"},
+    "23456789": {"name": "ROE, RICHARD", "location": "Oregon State Penitentiary",
+                 "status": "Inmate", "release_date": "11/02/2031"},
+    "1234567": {"name": "POE, JANE", "location": "Coffee Creek Correctional Facility",
+                "status": "Post-Prison Supervision", "release_date": "01/05/2024"},
+}
+
+_PAGE = """<!DOCTYPE html>
+<html><head><title>Oregon Offender Search</title>
+<script>
+var mojarra = {{jsfcljs: function (form, params, target) {{
+  for (var k in params) {{
+    var input = document.createElement('input');
+    input.type = 'hidden'; input.name = k; input.value = params[k];
+    form.appendChild(input);
+  }}
+  form.submit();
+}}}};
+</script></head>
+<body>{body}</body></html>"""
+
+_DISCLAIMER = """<form id="disclaimerForm" name="disclaimerForm" method="post" action="{app}/searchCriteria.jsf">
+<input type="hidden" name="disclaimerForm" value="disclaimerForm" />
+<p>This information is provided as a public service.</p>
+<input type="submit" id="disclaimerForm:btnAgree" name="disclaimerForm:btnAgree" value="Agree" />
+<input type="hidden" name="javax.faces.ViewState" id="javax.faces.ViewState" value="{view_state}" />
+</form>"""
+
+_SEARCH = """<form id="mainBodyForm" name="mainBodyForm" method="post" action="{app}/searchCriteria.jsf">
+<input type="hidden" name="mainBodyForm" value="mainBodyForm" />
+<label for="mainBodyForm:SidNumber">SID Number</label>
+<input type="text" id="mainBodyForm:SidNumber" name="mainBodyForm:SidNumber" value="" />
+<input type="submit" id="mainBodyForm:btnSearch" name="mainBodyForm:btnSearch" value="Search" />
+<input type="hidden" name="javax.faces.ViewState" id="javax.faces.ViewState" value="{view_state}" />
+</form>"""
+
+_RESULTS = """<form id="resultsForm" name="resultsForm" method="post" action="{app}/offenderDetails.jsf">
+<input type="hidden" name="resultsForm" value="resultsForm" />
+<table><tr><th>SID</th><th>Name</th></tr>
+<tr><td><a href="#" id="resultsForm:offenders:0:sidLink"
+ onclick="mojarra.jsfcljs(document.getElementById('resultsForm'),{{'resultsForm:offenders:0:sidLink':'resultsForm:offenders:0:sidLink','sid':'{sid}'}},'');return false">{sid}</a></td>
+<td>{name}</td></tr></table>
+<input type="hidden" name="javax.faces.ViewState" id="javax.faces.ViewState" value="{view_state}" />
+</form>"""
+
+_NO_RESULTS = """<span id="mainBodyForm:noResults" class="noResults">No offenders were found matching the search criteria.</span>"""
+
+_DETAILS = """<form id="offensesForm" name="offensesForm" method="post" action="{app}/offenderDetails.jsf">
+<table>
+<tr><th>Name</th><td><span id="offensesForm:name">{name}</span></td></tr>
+<tr><th>SID</th><td><span id="offensesForm:sid">{sid}</span></td></tr>
+<tr><th>Location</th><td><a href="#" title="The state institution or county where the offender is serving their sentence.">{location}</a></td></tr>
+<tr><th>Status</th><td><span id="offensesForm:status">{status}</span></td></tr>
+<tr><th>Release Date</th><td><span id="offensesForm:relDate">{release_date}</span></td></tr>
+</table>
+<input type="hidden" name="javax.faces.ViewState" id="javax.faces.ViewState" value="{view_state}" />
+</form>"""
+
+
+class StandinState:
+    """Offender fixtures, per-session disclaimer state and fault settings shared by the request handlers."""
+
+    def __init__(self, offenders=None, latency=0.0, jitter=0.0, error_rate=0.0, seed=None) -> None:
+        """
+        :param offenders: offenders keyed by SID number, defaults to :data:`FIXTURE_OFFENDERS`
+        :param latency: seconds every response is delayed by
+        :param jitter: up to this many further seconds, drawn uniformly per response
+        :param error_rate: fraction of requests answered with a 503 instead of the page
+        :param seed: seed for the jitter and error draws, for repeatable runs
+        """
+        self.offenders = dict(FIXTURE_OFFENDERS if offenders is None else offenders)
+        self.agreed_sessions = set()
+        self.lock = threading.Lock()
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.fail_next = 0  # This many upcoming requests get a 503 whatever the error rate
+        self.requests = 0
+        self.injected_errors = 0
+        self._random = random.Random(seed)
+
+    def find(self, sid):
+        return self.offenders.get(sid)
+
+    def draw_fault(self):
+        """Count a request and return ``(delay_seconds, fail)`` for it."""
+        with self.lock:
+            self.requests += 1
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter > 0 else 0.0)
+            fail = self.error_rate > 0 and self._random.random() < self.error_rate
+            if self.fail_next > 0:
+                self.fail_next -= 1
+                fail = True
+            if fail:
+                self.injected_errors += 1
+        return delay, fail
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    server_version = "DocpubStandin/1.0"
+
+    def log_message(self, format, *args):
+        pass  # Keep test and benchmark output quiet
+
+    @property
+    def state(self):
+        return self.server.state
+
+    def _session_id(self):
+        cookie = self.headers.get("Cookie", "")
+        for part in cookie.split(";"):
+            name, _, value = part.strip().partition("=")
+            if name == "JSESSIONID":
+                return value
+        return None
+
+    def _send_page(self, body, session_id, status=200):
+        payload = _PAGE.format(body=body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=UTF-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.send_header("Set-Cookie", f"JSESSIONID={session_id}; Path={APP_PATH}")
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _inject_fault(self):
+        # Delay the response, and answer with a 503 instead of the page when this request is to fail
+        delay, fail = self.state.draw_fault()
+        if delay > 0:
+            time.sleep(delay)
+        if fail:
+            payload = b"Service Unavailable"
+            self.send_response(503)
+            self.send_header("Content-Type", "text/plain")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+        return fail
+
+    def _read_form(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length).decode("utf-8")
+        return {k: v[0] for k, v in parse_qs(body, keep_blank_values=True).items()}
+
+    def _render(self, template, **values):
+        escaped = {k: html.escape(str(v), quote=True) for k, v in values.items()}
+        return template.format(app=APP_PATH, view_state=secrets.token_hex(8), **escaped)
+
+    def _search_page(self, session_id):
+        with self.state.lock:
+            agreed = session_id in self.state.agreed_sessions
+        return self._render(_SEARCH if agreed else _DISCLAIMER)
+
+    def do_GET(self):
+        if self._inject_fault():
+            return
+        path = urlparse(self.path).path
+        session_id = self._session_id() or secrets.token_hex(16)
+        if path != f"{APP_PATH}/searchCriteria.jsf":
+            self._send_page("<p>Not found</p>", session_id, status=404)
+            return
+        self._send_page(self._search_page(session_id), session_id)
+
+    def do_POST(self):
+        path = urlparse(self.path).path
+        session_id = self._session_id() or secrets.token_hex(16)
+        form = self._read_form()
+        if self._inject_fault():
+            return
+
+        if path == f"{APP_PATH}/searchCriteria.jsf" and "disclaimerForm:btnAgree" in form:
+            with self.state.lock:
+                self.state.agreed_sessions.add(session_id)
+            self._send_page(self._search_page(session_id), session_id)
+        elif path == f"{APP_PATH}/searchCriteria.jsf" and "mainBodyForm:SidNumber" in form:
+            sid = form["mainBodyForm:SidNumber"].strip()
+            offender = self.state.find(sid)
+            body = self._render(_SEARCH)
+            if offender is None:
+                body += _NO_RESULTS
+            else:
+                body += self._render(_RESULTS, sid=sid, name=offender["name"])
+            self._send_page(body, session_id)
+        elif path == f"{APP_PATH}/offenderDetails.jsf" and "sid" in form:
+            sid = form["sid"]
+            offender = self.state.find(sid)
+            if offender is None:
+                self._send_page("<p>Not found</p>", session_id, status=404)
+                return
+            self._send_page(self._render(_DETAILS, sid=sid, **offender), session_id)
+        else:
+            self._send_page("<p>Not found</p>", session_id, status=404)
+
+
+def start_standin(host="127.0.0.1", port=0, offenders=None, latency=0.0, jitter=0.0, error_rate=0.0, seed=None):
+    """
+    Start the stand-in server on a background thread.
+
+    The fault settings are those of :class:`StandinState` and can be changed on ``server.state`` later.
+
+    :returns: ``(server, base_url)``; call ``server.shutdown()`` to stop it
+    """
+    server = ThreadingHTTPServer((host, port), StandinHandler)
+    server.daemon_threads = True
+    server.state = StandinState(offenders, latency=latency, jitter=jitter, error_rate=error_rate, seed=seed)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://{host}:{server.server_address[1]}{APP_PATH}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve docpub fixture pages locally.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds to delay every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="up to this many further seconds per response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests failed with a 503")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer((args.host, args.port), StandinHandler)
+    server.daemon_threads = True
+    server.state = StandinState(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate)
+    print(f"Serving docpub stand-in at http://{args.host}:{args.port}{APP_PATH}/searchCriteria.jsf")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,409 @@
+import logging
+import threading
+import time
+
+from selenium.common.exceptions import (InvalidSessionIdException, NoSuchWindowException, TimeoutException,
+                                        WebDriverException)
+from selenium.webdriver.remote.webelement import WebElement
+
+
+# Browsers hosting tabs run with this page load strategy, so navigation returns without holding the browser
+TAB_PAGE_LOAD_STRATEGY = "none"
+
+# How long a tab waits for a page it navigated to, and how often it checks
+TAB_PAGE_LOAD_TIMEOUT = 30
+TAB_PAGE_LOAD_POLL_INTERVAL = 0.05
+
+# Set on the old document before a tab navigates; the new document starts without it
+_NAVIGATION_MARKER_SCRIPT = "window.__ojrcNavigating = true;"
+# Matches the "eager" page load strategy: the new document is parsed
+_PAGE_LOADED_SCRIPT = "return !window.__ojrcNavigating && document.readyState !== 'loading';"
+
+
+class DriverPool:
+    """
+    Keeps long-lived WebDrivers that worker threads borrow for each lookup.
+
+    Drivers are created lazily when no idle one is available and reused for every later lookup,
+    the most recently returned first, so only as many drivers exist as lookups have run at once.
+    A driver is only replaced when it is returned as unhealthy or fails the liveness check on
+    checkout. :meth:`resize` lowers the number of drivers kept, quitting the idle ones beyond it.
+    """
+
+    def __init__(self, driver_factory, health_check=None) -> None:
+        """
+        :param driver_factory: callable that builds a new WebDriver (normally ``init_webdriver``)
+        :param health_check: optional callable taking a driver and returning False once it must be replaced.
+            Defaults to a cheap WebDriver round trip.
+        """
+        self._driver_factory = driver_factory
+        self._health_check = health_check or self._is_healthy
+        self._lock = threading.Lock()
+        self._drivers = set()
+        self._idle = []
+        self._limit = None
+        self._closed = False
+
+    def checkout(self):
+        """Borrow an idle driver, launching a new one if none is available."""
+        while True:
+            with self._lock:
+                driver = self._idle.pop() if self._idle else None
+            if driver is None:
+                break
+            if self._health_check(driver):
+                return driver
+            logging.info("Replacing unhealthy WebDriver.")
+            self.discard(driver)
+
+        driver = self._driver_factory()
+        with self._lock:
+            if self._closed:
+                driver.quit()
+                raise RuntimeError("Driver pool has been closed.")
+            self._drivers.add(driver)
+        return driver
+
+    def checkin(self, driver, healthy: bool = True) -> None:
+        """Return a driver after a lookup. Unhealthy drivers, and drivers beyond the limit, are quit."""
+        with self._lock:
+            keep = healthy and not self._closed and driver in self._drivers and (
+                self._limit is None or len(self._drivers) <= self._limit)
+            if keep:
+                self._idle.append(driver)
+        if not keep:
+            self.discard(driver)
+
+    def resize(self, limit) -> None:
+        """Keep at most ``limit`` drivers (None for no limit); idle drivers beyond it are quit now, busy ones on checkin."""
+        with self._lock:
+            self._limit = limit
+            surplus = []
+            while limit is not None and self._idle and len(self._drivers) > limit:
+                driver = self._idle.pop(0)  # Least recently used first
+                self._drivers.discard(driver)
+                surplus.append(driver)
+        for driver in surplus:
+            self._quit(driver)
+        if surplus:
+            logging.info(f"Released {len(surplus)} idle WebDrivers after concurrency dropped to {limit}.")
+
+    def discard(self, driver) -> None:
+        """Quit a driver and forget it so a later checkout launches a replacement."""
+        with self._lock:
+            self._drivers.discard(driver)
+            if driver in self._idle:
+                self._idle.remove(driver)
+        self._quit(driver)
+
+    def close_all(self) -> None:
+        """Quit every driver the pool has launched."""
+        with self._lock:
+            self._closed = True
+            drivers = list(self._drivers)
+            self._drivers.clear()
+            self._idle.clear()
+        for driver in drivers:
+            self._quit(driver)
+
+    @staticmethod
+    def _quit(driver):
+        try:
+            driver.quit()
+        except Exception as e:
+            logging.error(f"Error quitting WebDriver: {e}")
+
+    @staticmethod
+    def _is_healthy(driver) -> bool:
+        try:
+            driver.current_url  # Cheap round trip that fails once the session is gone
+            return True
+        except WebDriverException:
+            return False
+
+
+class _Browser:
+    """One shared Chrome process and the tabs currently assigned to workers."""
+
+    def __init__(self):
+        self.driver = None  # Set by attach() once Chrome has launched
+        self.launched = threading.Event()
+        self.lock = threading.RLock()  # WebDriver commands act on the current tab, so one tab at a time
+        self.current_handle = None
+        self.free_handles = []
+        self.tabs = 0
+        self.alive = True
+
+    def attach(self, driver):
+        self.driver = driver
+        self.current_handle = driver.current_window_handle
+        self.free_handles = [self.current_handle]  # The initial window becomes the first tab
+
+    def switch_to(self, handle):
+        if self.current_handle != handle:
+            self.driver.switch_to.window(handle)
+            self.current_handle = handle
+
+
+class _TabElement:
+    """WebElement proxy that brings its tab to the front before every command."""
+
+    def __init__(self, element, tab):
+        self._element = element
+        self._tab = tab
+
+    def __getattr__(self, name):
+        return self._tab._call(lambda: getattr(self._element, name))
+
+
+class TabDriver:
+    """
+    WebDriver proxy bound to one tab of a shared browser.
+
+    Every command (and every command on elements it returns) takes the browser lock and switches
+    to this tab first, so several workers can each drive their own tab of one Chrome process.
+    The browser must use ``TAB_PAGE_LOAD_STRATEGY``: commands then return as soon as a navigation
+    starts and :meth:`get` waits for the page with the lock released, so pages load in background
+    tabs while other workers keep driving theirs.
+    """
+
+    def __init__(self, browser, handle):
+        self._browser = browser
+        self._handle = handle
+
+    def _wrap(self, value):
+        if isinstance(value, WebElement):
+            return _TabElement(value, self)
+        if isinstance(value, list):
+            return [self._wrap(item) for item in value]
+        if isinstance(value, dict):
+            return {key: self._wrap(item) for key, item in value.items()}
+        return value
+
+    def _call(self, get_attribute):
+        with self._browser.lock:
+            self._browser.switch_to(self._handle)
+            value = get_attribute()
+        if callable(value):
+            def locked_call(*args, **kwargs):
+                with self._browser.lock:
+                    self._browser.switch_to(self._handle)
+                    return self._wrap(value(*args, **kwargs))
+            return locked_call
+        return self._wrap(value)
+
+    def __getattr__(self, name):
+        return self._call(lambda: getattr(self._browser.driver, name))
+
+    def get(self, url):
+        """Navigate this tab to ``url`` and wait until the new document is parsed."""
+        with self._browser.lock:
+            self._browser.switch_to(self._handle)
+            driver = self._browser.driver
+            driver.execute_script(_NAVIGATION_MARKER_SCRIPT)
+            driver.get(url)
+
+        # Each check takes the browser only briefly; other tabs run their commands in between
+        deadline = time.monotonic() + TAB_PAGE_LOAD_TIMEOUT
+        while True:
+            with self._browser.lock:
+                self._browser.switch_to(self._handle)
+                try:
+                    if self._browser.driver.execute_script(_PAGE_LOADED_SCRIPT):
+                        return
+                except (NoSuchWindowException, InvalidSessionIdException):
+                    raise
+                except WebDriverException:
+                    pass  # The document is being replaced; check again
+            if time.monotonic() >= deadline:
+                raise TimeoutException(f"Timed out after {TAB_PAGE_LOAD_TIMEOUT}s loading {url}")
+            time.sleep(TAB_PAGE_LOAD_POLL_INTERVAL)
+
+    def quit(self):
+        """Tabs are closed by their TabPool; quitting the shared browser from a tab is a no-op."""
+
+
+class TabPool:
+    """
+    Drop-in alternative to :class:`DriverPool` that lends each lookup a tab, not a browser.
+
+    Up to ``tabs_per_browser`` tabs share one Chrome process, which saves the hundreds of MB of
+    RSS a browser per worker costs. A tab that fails is closed and replaced; if the whole browser
+    has died, it is quit and its workers move to a new one. :meth:`resize` closes idle tabs beyond
+    the limit and quits browsers left without tabs.
+    """
+
+    def __init__(self, driver_factory, tabs_per_browser: int = 4) -> None:
+        """
+        :param driver_factory: callable that builds a new WebDriver (normally ``init_webdriver``)
+        :param tabs_per_browser: how many worker tabs one browser may host
+        """
+        self._driver_factory = driver_factory
+        self._tabs_per_browser = max(1, tabs_per_browser)
+        self._lock = threading.Lock()
+        self._browsers = []
+        self._idle = []
+        self._limit = None
+        self._closed = False
+
+    def _open_tab(self):
+        while True:
+            # Take a tab slot under the lock; a browser still launching counts, so workers fill it up
+            with self._lock:
+                if self._closed:
+                    raise RuntimeError("Tab pool has been closed.")
+                browser = next((b for b in self._browsers if b.alive and b.tabs < self._tabs_per_browser), None)
+                launch = browser is None
+                if launch:
+                    browser = _Browser()
+                    self._browsers.append(browser)
+                browser.tabs += 1
+
+            if launch:
+                self._launch(browser)
+                break
+            browser.launched.wait()
+            if browser.driver is not None and browser.alive:
+                break
+            with self._lock:
+                browser.tabs -= 1  # Its launch failed or the pool closed; try again
+
+        try:
+            with browser.lock:
+                if browser.free_handles:
+                    handle = browser.free_handles.pop()
+                else:
+                    browser.driver.switch_to.new_window("tab")
+                    handle = browser.driver.current_window_handle
+                    browser.current_handle = handle
+        except WebDriverException:
+            with self._lock:
+                browser.tabs -= 1
+            self._retire_browser(browser)
+            raise
+        return TabDriver(browser, handle)
+
+    def _launch(self, browser):
+        # Chrome takes seconds to start, so it is launched without holding the pool lock
+        try:
+            driver = self._driver_factory()
+        except Exception:
+            with self._lock:
+                browser.alive = False
+                browser.tabs -= 1
+                if browser in self._browsers:
+                    self._browsers.remove(browser)
+            browser.launched.set()
+            raise
+
+        with self._lock:
+            browser.attach(driver)
+            closed = self._closed
+        browser.launched.set()
+        if closed:
+            # close_all() ran during the launch and skipped this browser
+            try:
+                driver.quit()
+            except Exception as e:
+                logging.error(f"Error quitting WebDriver: {e}")
+            raise RuntimeError("Tab pool has been closed.")
+
+    def checkout(self):
+        """Borrow an idle tab, opening a new one if none is available."""
+        while True:
+            with self._lock:
+                tab = self._idle.pop() if self._idle else None
+            if tab is None:
+                return self._open_tab()
+            if tab._browser.alive and DriverPool._is_healthy(tab):
+                return tab
+            logging.info("Replacing unhealthy browser tab.")
+            self.discard(tab)
+
+    def _tab_count(self):
+        return sum(browser.tabs for browser in self._browsers)
+
+    def checkin(self, tab, healthy: bool = True) -> None:
+        """Return a tab after a lookup. Unhealthy tabs, and tabs beyond the limit, are closed."""
+        with self._lock:
+            keep = healthy and not self._closed and tab._browser.alive and (
+                self._limit is None or self._tab_count() <= self._limit)
+            if keep:
+                self._idle.append(tab)
+        if not keep:
+            self.discard(tab)
+            self._retire_empty_browsers()
+
+    def resize(self, limit) -> None:
+        """Keep at most ``limit`` tabs (None for no limit); idle tabs beyond it are closed now, busy ones on checkin."""
+        with self._lock:
+            self._limit = limit
+            surplus = []
+            while limit is not None and self._idle and self._tab_count() - len(surplus) > limit:
+                surplus.append(self._idle.pop(0))  # Least recently used first
+        for tab in surplus:
+            self.discard(tab)
+        self._retire_empty_browsers()
+        if surplus:
+            logging.info(f"Closed {len(surplus)} idle browser tabs after concurrency dropped to {limit}.")
+
+    def _retire_empty_browsers(self):
+        # A browser whose tabs have all been closed only holds memory
+        with self._lock:
+            empty = [browser for browser in self._browsers if browser.tabs == 0]
+            for browser in empty:
+                browser.alive = False  # No new tab may open in it from here on
+                self._browsers.remove(browser)
+        for browser in empty:
+            try:
+                browser.driver.quit()
+            except Exception as e:
+                logging.error(f"Error quitting WebDriver: {e}")
+
+    def discard(self, tab) -> None:
+        """Close a tab; quits its browser if the browser itself is no longer reachable."""
+        with self._lock:
+            if tab in self._idle:
+                self._idle.remove(tab)
+        browser = tab._browser
+        with self._lock:
+            browser.tabs -= 1
+        if not browser.alive:
+            return
+        try:
+            with browser.lock:
+                if len(browser.driver.window_handles) > 1:
+                    browser.switch_to(tab._handle)
+                    browser.driver.close()
+                    browser.current_handle = None
+                else:
+                    browser.free_handles.append(tab._handle)  # Keep the last window open for the next tab
+        except WebDriverException:
+            self._retire_browser(browser)
+
+    def _retire_browser(self, browser):
+        with self._lock:
+            browser.alive = False
+            if browser in self._browsers:
+                self._browsers.remove(browser)
+        try:
+            browser.driver.quit()
+        except Exception as e:
+            logging.error(f"Error quitting WebDriver: {e}")
+
+    def close_all(self) -> None:
+        """Quit every browser the pool has launched."""
+        with self._lock:
+            self._closed = True
+            browsers = list(self._browsers)
+            self._browsers.clear()
+            self._idle.clear()
+            for browser in browsers:
+                browser.alive = False
+        for browser in browsers:
+            if browser.driver is None:
+                continue  # Still launching; its launcher quits it on seeing the pool closed
+            try:
+                browser.driver.quit()
+            except Exception as e:
+                logging.error(f"Error quitting WebDriver: {e}")
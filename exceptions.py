@@ -1,2 +1,7 @@
 class RecaptchaException(Exception):
-    pass
\ No newline at end of file
+    pass
+
+
+class LookupCancelled(Exception):
+    """Raised inside a lookup when the run has been asked to stop."""
+    pass
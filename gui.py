@@ -1,32 +1,76 @@
 import sys
 import os
+import queue
 import threading
+import multiprocessing
 import tkinter as tk
-from tkinter import filedialog, scrolledtext
+from tkinter import filedialog, scrolledtext, ttk
 import openpyxl
 
 
 from PIL import Image, ImageTk
 
 # Import the run_main_process function from main.py
+from cancellation import CancellationToken
 from main import run_main_process
+from progress import format_progress
 
-# Global flag to indicate if the stop button has been pressed
-stop_flag = False
+# Cancellation token of the current search; the stop button cancels it
+stop_flag = CancellationToken()
+
+# Log messages waiting to be shown; any thread may write, only the Tk main loop reads
+log_queue = queue.SimpleQueue()
+
+# The activity log keeps only the most recent lines
+LOG_MAX_LINES = 5000
+
+# How often the Tk main loop moves queued messages into the log, and at most how many per pass
+LOG_FLUSH_INTERVAL_MS = 100
+LOG_MAX_BATCH = 2000
+
+# Latest progress event from the running search; the worker thread replaces it, the Tk main loop shows it
+latest_progress = None
+
+# How often the progress bar and stats line are refreshed
+PROGRESS_REFRESH_MS = 500
 
 class TextRedirector:
-    def __init__(self, text_widget):
-        self.text_widget = text_widget
+    """File-like sink for sys.stdout/sys.stderr that queues messages instead of touching Tk from worker threads."""
+
+    def __init__(self, message_queue):
+        self.message_queue = message_queue
 
     def write(self, message):
-        self.text_widget.config(state=tk.NORMAL)
-        self.text_widget.insert(tk.END, message)
-        self.text_widget.config(state=tk.DISABLED)
-        self.text_widget.see(tk.END)  # Scroll to the bottom
+        if message:
+            self.message_queue.put(message)
 
     def flush(self):
         pass  # This method is needed for Python 3 compatibility
 
+# Function to move queued log messages into the log window, run on the Tk main loop
+def flush_log_queue(root, text_widget):
+    messages = []
+    try:
+        while len(messages) < LOG_MAX_BATCH:
+            messages.append(log_queue.get_nowait())
+    except queue.Empty:
+        pass
+
+    if messages:
+        text_widget.config(state=tk.NORMAL)
+        text_widget.insert(tk.END, "".join(messages))
+
+        # Drop the oldest lines beyond the cap so long runs do not slow the widget down
+        line_count = int(text_widget.index("end-1c").split(".")[0])
+        if line_count > LOG_MAX_LINES:
+            text_widget.delete("1.0", f"{line_count - LOG_MAX_LINES + 1}.0")
+        text_widget.config(state=tk.DISABLED)
+        text_widget.see(tk.END)  # Scroll to the bottom
+
+    # Come back sooner while a backlog remains
+    delay = 1 if len(messages) == LOG_MAX_BATCH else LOG_FLUSH_INTERVAL_MS
+    root.after(delay, flush_log_queue, root, text_widget)
+
 # Function to get the correct path for resources
 def resource_path(relative_path):
     """ Get the absolute path to the resource, works for both development and PyInstaller """
@@ -38,10 +82,23 @@ def resource_path(relative_path):
 
     return os.path.join(base_path, relative_path)
 
+# Function to receive progress events from the search thread
+def record_progress(event):
+    global latest_progress
+    latest_progress = event  # Replacing a reference is atomic, so no lock is needed
+
+# Function to show the latest progress event, run on the Tk main loop at a fixed rate
+def refresh_progress(root, progress_bar, progress_label):
+    event = latest_progress
+    if event is not None:
+        progress_bar.config(maximum=max(event["total"], 1), value=event["completed"])
+        progress_label.config(text=format_progress(event))
+    root.after(PROGRESS_REFRESH_MS, refresh_progress, root, progress_bar, progress_label)
+
 # Function to handle search process
 def search_process():
-    global stop_flag, entry_input, entry_output, log_window
-    stop_flag = False  # Reset the stop flag when starting a new search
+    global stop_flag, entry_input, entry_output, log_window, resume_var, latest_progress
+    stop_flag = CancellationToken()  # A fresh token for every new search
 
     input_file = entry_input.get().strip()
     output_file = entry_output.get().strip()
@@ -57,7 +114,10 @@ def search_process():
 
     try:
         # Execute the main process in a separate daemon thread to avoid freezing the GUI
-        thread = threading.Thread(target=run_main_process, args=(input_file, output_file, lambda: stop_flag), daemon=True)
+        latest_progress = None
+        thread = threading.Thread(target=run_main_process, args=(input_file, output_file, stop_flag),
+                                  kwargs={"resume": resume_var.get(), "progress_callback": record_progress},
+                                  daemon=True)
         thread.start()
 
     except Exception as e:
@@ -77,13 +137,9 @@ def browse_output_file():
     entry_output.insert(0, filename)
 
 
-# Function to output logs to the log window
+# Function to output logs to the log window, in order with the redirected output
 def log_output(message):
-    global log_window
-    log_window.config(state=tk.NORMAL)
-    log_window.insert(tk.END, message)
-    log_window.config(state=tk.DISABLED)
-    log_window.see(tk.END)  # Scroll to the bottom
+    log_queue.put(message)
 
 # Function to clear the activity log
 def clear_log():
@@ -94,12 +150,11 @@ def clear_log():
 
 # Function to stop the search process
 def stop_process():
-    global stop_flag
-    stop_flag = True
-    log_output("Stop signal sent. Please wait for subscribers to be processed.\n")
+    stop_flag.cancel()
+    log_output("Stop signal sent. Cancelling queued lookups and writing partial results.\n")
 
 def main():
-    global entry_input, entry_output, log_window
+    global entry_input, entry_output, log_window, resume_var
 
     # Create the main window
     root = tk.Tk()
@@ -135,10 +190,21 @@ def main():
     button_browse_output = tk.Button(root, text="Browse", command=browse_output_file)
     button_browse_output.pack(pady=padding_y, padx=padding_x, anchor=tk.W)
 
+    # Resume an interrupted run from the journal kept beside the output file
+    resume_var = tk.BooleanVar(value=False)
+    check_resume = tk.Checkbutton(root, text="Resume interrupted run", variable=resume_var)
+    check_resume.pack(pady=(0, padding_y), padx=padding_x, anchor=tk.W)
+
     # Create and pack search button widget with padding
     button_search = tk.Button(root, text="Search", command=search_process)
     button_search.pack(pady=padding_y, padx=padding_x, anchor=tk.W)
 
+    # Progress of the current search
+    progress_bar = ttk.Progressbar(root, orient=tk.HORIZONTAL, length=560, mode="determinate")
+    progress_bar.pack(pady=(padding_y, 0), padx=padding_x, anchor=tk.W)
+    progress_label = tk.Label(root, text="No search running.")
+    progress_label.pack(padx=padding_x, anchor=tk.W)
+
     # Add a title above the log window
     label_log = tk.Label(root, text="Activity Log", font=("Arial", 14, "bold"))
     label_log.pack(pady=(padding_y, 0), padx=padding_x, anchor=tk.W)
@@ -171,12 +237,16 @@ def main():
     except Exception as e:
         print(f"Error loading background image: {e}")
 
-    # Redirect stdout and stderr to the log window
-    sys.stdout = TextRedirector(log_window)
-    sys.stderr = TextRedirector(log_window)
+    # Redirect stdout and stderr to the log window through the queue
+    sys.stdout = TextRedirector(log_queue)
+    sys.stderr = TextRedirector(log_queue)
+    root.after(LOG_FLUSH_INTERVAL_MS, flush_log_queue, root, log_window)
+    root.after(PROGRESS_REFRESH_MS, refresh_progress, root, progress_bar, progress_label)
 
     # Run the Tkinter main loop
     root.mainloop()
 
 if __name__ == "__main__":
+    # Needed for multi-process lookups in the frozen (PyInstaller) build
+    multiprocessing.freeze_support()
     main()
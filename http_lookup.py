@@ -0,0 +1,245 @@
+import logging
+import re
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from metrics import run_metrics
+from rate_limiter import page_load_limiter
+
+LOCATION_TITLE = "The state institution or county where the offender is serving their sentence."
+
+# Matches the {'id':'value'} parameters of a JSF command link onclick (Mojarra and MyFaces)
+_JSF_LINK_PARAMS = re.compile(r"'([^']+)'\s*:\s*'([^']*)'")
+_MYFACES_SUBMIT = re.compile(r"submitForm\(\s*'([^']+)'\s*,\s*'([^']+)'")
+
+
+class _Form:
+    def __init__(self, attrs):
+        self.id = attrs.get("id") or attrs.get("name")
+        self.action = attrs.get("action", "")
+        self.fields = {}
+        self.submit_buttons = []
+
+
+class _Link:
+    def __init__(self, attrs, form):
+        self.href = attrs.get("href", "")
+        self.onclick = attrs.get("onclick", "")
+        self.title = attrs.get("title", "")
+        self.id = attrs.get("id")
+        self.form = form
+        self.text = ""
+
+
+class JsfPageParser(HTMLParser):
+    """Collects the forms, links and id'd element text a docpub JSF page is made of."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.forms = {}
+        self.links = []
+        self.texts = {}
+        self._form = None
+        self._link = None
+        self._open_ids = []  # Stack of (tag, id or None) to attribute text to id'd elements
+        self.container_ids = set()  # Ids of elements that have child elements
+
+    def handle_starttag(self, tag, attrs):
+        attrs = {k: (v if v is not None else "") for k, v in attrs}
+
+        if tag == "form":
+            self._form = _Form(attrs)
+            if self._form.id:
+                self.forms[self._form.id] = self._form
+        elif tag in ("input", "select", "textarea", "button") and self._form is not None:
+            name = attrs.get("name")
+            input_type = attrs.get("type", "text").lower()
+            if name:
+                if input_type == "submit" or tag == "button":
+                    self._form.submit_buttons.append((name, attrs.get("value", "")))
+                elif input_type not in ("checkbox", "radio") or "checked" in attrs:
+                    self._form.fields[name] = attrs.get("value", "")
+        elif tag == "a":
+            self._link = _Link(attrs, self._form)
+            self.links.append(self._link)
+
+        for _, element_id in self._open_ids:
+            if element_id:
+                self.container_ids.add(element_id)
+
+        if tag not in ("input", "br", "img", "meta", "link", "hr"):
+            self._open_ids.append((tag, attrs.get("id")))
+            if attrs.get("id"):
+                self.texts.setdefault(attrs["id"], "")
+
+    def handle_endtag(self, tag):
+        if tag == "form":
+            self._form = None
+        elif tag == "a":
+            self._link = None
+
+        # Pop back to the matching open tag, tolerating unclosed children
+        for i in range(len(self._open_ids) - 1, -1, -1):
+            if self._open_ids[i][0] == tag:
+                del self._open_ids[i:]
+                break
+
+    def handle_data(self, data):
+        if self._link is not None:
+            self._link.text += data
+        for _, element_id in self._open_ids:
+            if element_id:
+                self.texts[element_id] += data
+
+    def text(self, element_id):
+        value = self.texts.get(element_id)
+        return value.strip() if value is not None else None
+
+
+def parse_page(html):
+    parser = JsfPageParser()
+    parser.feed(html)
+    parser.close()
+    return parser
+
+
+def parse_inmate_details(page):
+    """Read the same four fields ``extract_inmate_details`` reads from the offensesForm page."""
+    name = page.text("offensesForm:name")
+    status = page.text("offensesForm:status")
+    release_date = page.text("offensesForm:relDate")
+    location = next((link.text.strip() for link in page.links if link.title == LOCATION_TITLE), None)
+
+    if name is None or status is None or release_date is None or location is None:
+        return None
+
+    # Same extra leaf fields the Selenium backend returns from the offensesForm
+    extra = {
+        element_id[len("offensesForm:"):]: value.strip()
+        for element_id, value in page.texts.items()
+        if element_id.startswith("offensesForm:") and element_id not in page.container_ids
+    }
+    for key in ("name", "status", "relDate"):
+        extra.pop(key, None)
+
+    return {
+        "Name": name,
+        "Location": location,
+        "Status": status,
+        "Release Date": release_date,
+        "Offense Fields": extra
+    }
+
+
+class HttpLookupSession:
+    """
+    Browser-free docpub lookup over one pooled ``requests.Session``.
+
+    Performs the same flow ``search_gdc`` drives in Chrome: accept the disclaimer, post the SID
+    search with the current JSF ViewState, follow the DOC number link and parse the offensesForm.
+    """
+
+    def __init__(self, base_url, timeout: float = 10, pool_size: int = 4) -> None:
+        """
+        :param base_url: docpub application root, e.g. ``https://docpub.state.or.us/OOS``
+        :param timeout: per-request timeout in seconds
+        :param pool_size: number of keep-alive connections the session may hold open
+        """
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.current_url = None
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+
+    def _request(self, method, url, data=None):
+        response = self._session.request(method, url, data=data, timeout=self.timeout)
+        response.raise_for_status()
+        self.current_url = response.url
+        return parse_page(response.text)
+
+    def _submit(self, form, extra_fields):
+        fields = dict(form.fields)
+        fields.update(extra_fields)
+        return self._request("POST", urljoin(self.current_url, form.action or self.current_url), data=fields)
+
+    def _follow_link(self, page, link):
+        href = link.href.strip()
+        if href and href != "#" and not href.lower().startswith("javascript:"):
+            return self._request("GET", urljoin(self.current_url, href))
+
+        # JSF command links post their enclosing form with the link id as an extra parameter
+        form = link.form
+        myfaces = _MYFACES_SUBMIT.search(link.onclick)
+        if myfaces:
+            form = page.forms.get(myfaces.group(1), form)
+            extra = {myfaces.group(2): myfaces.group(2)}
+        else:
+            extra = dict(_JSF_LINK_PARAMS.findall(link.onclick))
+            if not extra and link.id:
+                extra = {link.id: link.id}
+        if form is None:
+            logging.error("Error following DOC number link: no enclosing form found.")
+            return None
+        return self._submit(form, extra)
+
+    def search(self, doc_number, first_name, last_name):
+        # Pace lookups across all workers to the configured rate
+        run_metrics.record("rate_limit_wait", page_load_limiter.acquire())
+        with run_metrics.span("navigate"):
+            page = self._request("GET", f"{self.base_url}/searchCriteria.jsf")
+
+        # Accept the disclaimer if this session has not accepted it yet
+        disclaimer = page.forms.get("disclaimerForm")
+        if disclaimer is not None:
+            agree = next((b for b in disclaimer.submit_buttons if b[0] == "disclaimerForm:btnAgree"), None)
+            if agree is not None:
+                with run_metrics.span("disclaimer"):
+                    page = self._submit(disclaimer, {agree[0]: agree[1]})
+
+        # Remove leading zeros from DOC number
+        doc_number = str(int(doc_number))
+
+        search_form = page.forms.get("mainBodyForm")
+        if search_form is None or "mainBodyForm:SidNumber" not in search_form.fields:
+            error_message = f"Error locating the SID Number input field for DOC number {doc_number}, Name: {first_name} {last_name}"
+            logging.info(error_message)
+            print(error_message)
+            return None
+
+        # Pressing Enter submits the form together with its first submit button; the response is the results page
+        extra = {"mainBodyForm:SidNumber": doc_number}
+        if search_form.submit_buttons:
+            extra[search_form.submit_buttons[0][0]] = search_form.submit_buttons[0][1]
+        with run_metrics.span("submit"):
+            page = self._submit(search_form, extra)
+
+        doc_link = next((link for link in page.links if link.text.strip() == doc_number), None)
+        if doc_link is None:
+            error_message = f"Error finding AIC with DOC number: {doc_number}, Name: {first_name} {last_name}"
+            logging.info(error_message)
+            print(error_message)
+            return None
+
+        with run_metrics.span("link_click"):
+            page = self._follow_link(page, doc_link)
+        if page is None:
+            return None
+
+        with run_metrics.span("extract"):
+            details = parse_inmate_details(page)
+        if details is None:
+            print("Error extracting inmate details: offensesForm fields not found")
+        return details
+
+    def quit(self):
+        self._session.close()
+
+
+def search_gdc_http(session, doc_number, first_name, last_name):
+    """HTTP counterpart of ``main.search_gdc``, run against a pooled ``HttpLookupSession``."""
+    return session.search(doc_number, first_name, last_name)
@@ -1,18 +1,40 @@
 import ctypes
+import itertools
 import logging
+import multiprocessing
+import multiprocessing.util
+import threading
 import time
 import pandas as pd
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from selenium.common.exceptions import NoSuchElementException, TimeoutException, WebDriverException
+from collections import deque
+import requests
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from selenium.common.exceptions import NoSuchElementException, SessionNotCreatedException, StaleElementReferenceException, TimeoutException, WebDriverException
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
-from webdriver_manager.chrome import ChromeDriverManager
 from selenium import webdriver
-from datetime import datetime
+from urllib3.exceptions import HTTPError as Urllib3HTTPError
+from datetime import date, datetime, time as dt_time
 import os
 
+from concurrency import POLITE_MAX_WORKERS, AdaptiveConcurrency, ErrorTally
+from cancellation import sleep_unless_stopped
+from chromedriver_path import invalidate_chromedriver_path, resolve_chromedriver_path
+from driver_pool import TAB_PAGE_LOAD_STRATEGY, DriverPool, TabPool
+from exceptions import LookupCancelled
+from metrics import run_metrics
+from http_lookup import LOCATION_TITLE, HttpLookupSession, search_gdc_http
+from retry_policy import backoff_delay, is_fatal_session_error, retry_step
+from result_cache import DEFAULT_CACHE_PATH, DEFAULT_CACHE_TTL_HOURS, ResultCache
+from output_writer import ResultColumns, StreamingCsvWriter
+from progress import OUTCOME_ERROR, OUTCOME_FOUND, OUTCOME_NOT_FOUND, RunProgress
+from rate_limiter import DEFAULT_RATE_BURST, DEFAULT_RATE_LIMIT, page_load_limiter
+from run_journal import RunJournal
+from scheduler import BoundedScheduler
+
 
 # Constants to prevent sleep
 #ES_CONTINUOUS = 0x80000000
@@ -25,108 +47,348 @@ import os
     #ctypes.windll.kernel32.SetThreadExecutionState(ES_CONTINUOUS)
 
 
-# Excel Loader
-def load_excel(file_path):
-    try:
-        # Load the Excel file into a DataFrame
-        data = pd.read_excel(file_path, engine='openpyxl')
-        print("Columns in Excel after loading:", data.columns.tolist())
-        return data
-    except Exception as e:
-        logging.error(f"Error loading Excel file: {e}")
-        print(f"Error loading Excel file: {e}")
-        return None
+# Rows per normalized batch yielded by iter_roster_chunks
+ROSTER_CHUNK_SIZE = 1000
+
+# Rename columns to match expected names if they are different in input
+COLUMN_RENAME_MAP = {
+    'last name': 'lastname',
+    'fist name': 'firstname',
+    'doc number': 'docnumber',
+    'previous location': 'previouslocation',
+    'current': 'current',
+    'out?': 'out',
+    'street': 'street',
+    'city': 'city',
+    'state': 'state',
+    'zip': 'zip',
+    'date of search': 'date of search',
+    'initials': 'initials',
+    'phone': 'phone',
+    'notes': 'notes'
+}
+
+# Columns the lookup results are written to, added as "N/A" when missing
+REQUIRED_COLUMNS = ["location", "status", "release date", "date of search"]
+
+
+# A DOC number as text: optional leading zeros, the digits, and an optional ".0" left by spreadsheets
+DOC_NUMBER_PATTERN = r"^0*(\d+)(?:\.0*)?$"
+
+
+def normalize_doc_numbers(doc_numbers):
+    """
+    Vectorized DOC number clean-up: strip, validate and zero-pad to 8 digits.
+
+    Blank values and values that are not a whole number become "MISSING".
+    """
+    text = doc_numbers.astype("string").str.strip()
+    digits = text.str.extract(DOC_NUMBER_PATTERN, expand=False)
+
+    invalid = text.notna() & (text != "") & digits.isna()
+    if invalid.any():
+        logging.info(f"Marked {int(invalid.sum())} invalid DOC numbers as MISSING: {text[invalid].head(5).tolist()}")
+
+    return digits.str.zfill(8).fillna("MISSING").astype(object)
+
+
+def normalize_roster(chunk):
+    # Clean column names by stripping whitespace and converting to consistent case
+    chunk.columns = chunk.columns.str.strip().str.lower()
+    chunk.rename(columns=COLUMN_RENAME_MAP, inplace=True)
+
+    if 'docnumber' in chunk.columns:
+        # Ensure DOCNumber is properly formatted, handle NaN values
+        chunk['docnumber'] = normalize_doc_numbers(chunk['docnumber'])
+
+    # Ensure required columns are in the DataFrame
+    for col in REQUIRED_COLUMNS:
+        if col not in chunk.columns:
+            chunk[col] = "N/A"
+    return chunk
+
+
+def _iter_csv_chunks(file_path, chunksize):
+    # Cells are read as text so every chunk formats its values the same way
+    return pd.read_csv(file_path, encoding="utf-8-sig", dtype=str, chunksize=chunksize)
 
-# CSV Loader
-def load_csv(file_path):
+
+def _excel_rows_to_text(rows, columns):
+    """
+    Build a chunk of text cells from openpyxl values, formatting dates the way pd.read_excel + to_csv did.
+
+    A column whose cells are all dates is written as YYYY-MM-DD when none of them has a time of
+    day, and as YYYY-MM-DD HH:MM:SS otherwise; every other cell is written with str().
+    """
+    text_columns = []
+    for values in zip(*rows):
+        present = [value for value in values if value is not None]
+        if present and all(isinstance(value, (datetime, date)) for value in present):
+            date_only = all(not isinstance(value, datetime) or value.time() == dt_time() for value in present)
+            date_format = "%Y-%m-%d" if date_only else "%Y-%m-%d %H:%M:%S"
+            text_columns.append([None if value is None else value.strftime(date_format) for value in values])
+        else:
+            text_columns.append([None if value is None else str(value) for value in values])
+    return pd.DataFrame(dict(enumerate(text_columns))).set_axis(columns, axis=1)
+
+
+def _iter_excel_chunks(file_path, chunksize):
+    import openpyxl  # Only needed for Excel rosters, as with pd.read_excel(engine='openpyxl')
+
+    workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
     try:
-        data = pd.read_csv(file_path, encoding="utf-8-sig")
-        print("Columns in CSV after loading:", data.columns.tolist())
-        return data
-    except Exception as e:
-        logging.error(f"Error loading CSV file: {e}")
-        print(f"Error loading CSV file: {e}")
-        return None
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = [str(name) if name is not None else f"Unnamed: {i}" for i, name in enumerate(header)]
+
+        batch = []
+        for row in rows:
+            if all(value is None or value == "" for value in row):
+                continue  # Blank or formatted-but-empty rows, which pd.read_excel skipped
+            values = list(row[:len(columns)])
+            values.extend([None] * (len(columns) - len(values)))
+            batch.append(values)
+            if len(batch) == chunksize:
+                yield _excel_rows_to_text(batch, columns)
+                batch = []
+        if batch:
+            yield _excel_rows_to_text(batch, columns)
+    finally:
+        workbook.close()
+
+
+def iter_roster_chunks(file_path, chunksize=ROSTER_CHUNK_SIZE, timings=None):
+    """
+    Yield the roster as normalized DataFrame batches of at most ``chunksize`` rows.
+
+    Applies the same column clean-up, renames and DOC number formatting ``run_main_process``
+    has always applied, and indexes every batch by its rows' position in the whole file.
+    If ``timings`` is a dict, seconds spent reading and normalizing are added to its
+    "read" and "normalize" entries.
+    """
+    if timings is None:
+        timings = {}
+    timings.setdefault("read", 0.0)
+    timings.setdefault("normalize", 0.0)
 
-# File Loader (determines if CSV or Excel)
-def load_file(file_path):
     if file_path.lower().endswith('.csv'):
-        return load_csv(file_path)
+        chunks = _iter_csv_chunks(file_path, chunksize)
     elif file_path.lower().endswith('.xlsx'):
-        return load_excel(file_path)
+        chunks = _iter_excel_chunks(file_path, chunksize)
     else:
         print("Unsupported file format. Please provide a CSV or Excel (.xlsx) file.")
-        return None
-
-# Excel Writer
-def update_excel(file_path, data, original_columns):
-    if not data:
-        logging.info("No data to write to Excel.")
-        print("No data to write to Excel.")
         return
 
-    # Create a DataFrame using the original columns to maintain consistency
-    df = pd.DataFrame(data)
-
-    # Reorder columns to match the original input Excel, adding missing columns as blank if necessary
-    for column in original_columns:
-        if column not in df.columns:
-            df[column] = ""  # Add missing columns as empty
-    df = df[original_columns]
-
-    # Write the DataFrame to an Excel file without index
+    position = 0
     try:
-        df.to_excel(file_path, index=False, engine='xlsxwriter')
-        logging.info(f"Data successfully written to Excel: {file_path}")
-        print(f"Data successfully written to Excel: {file_path}")
+        while True:
+            stage_start = time.perf_counter()
+            chunk = next(chunks, None)
+            timings["read"] += time.perf_counter() - stage_start
+            if chunk is None:
+                return
+
+            stage_start = time.perf_counter()
+            chunk.index = pd.RangeIndex(position, position + len(chunk))
+            position += len(chunk)
+            chunk = normalize_roster(chunk)
+            timings["normalize"] += time.perf_counter() - stage_start
+            yield chunk
     except Exception as e:
-        logging.error(f"Error writing data to Excel: {e}")
-        print(f"Error writing data to Excel: {e}")
-
-# CSV Writer
-def update_csv(file_path, data, original_columns):
-    if not data:
-        logging.info("No data to write to CSV.")
-        print("No data to write to CSV.")
-        return
+        logging.error(f"Error loading roster file: {e}")
+        print(f"Error loading roster file: {e}")
+        raise
 
-    # Create a DataFrame using the original columns to maintain consistency
-    df = pd.DataFrame(data)
 
-    # Reorder columns to match the original input CSV, adding missing columns as blank if necessary
-    for column in original_columns:
-        if column not in df.columns:
-            df[column] = ""  # Add missing columns as empty
-    df = df[original_columns]
+# Root of the docpub offender search; override to point lookups at a local stand-in
+DOCPUB_BASE_URL = os.environ.get("OJRC_DOCPUB_URL", "https://docpub.state.or.us/OOS").rstrip("/")
+
+# Starting (or, without adaptive concurrency, fixed) number of concurrent lookups, and how many
+# queued lookups each worker may have waiting when concurrency is fixed
+MAX_WORKERS = 3
+QUEUE_DEPTH_PER_WORKER = 2
+
+# Lookup backends selectable from run_main_process
+BACKEND_SELENIUM = "selenium"
+BACKEND_HTTP = "http"
+
+# Ceiling in seconds for the search results (DOC link or "no results" marker) to appear
+RESULT_WAIT_TIMEOUT = 10
+
+# Marker the search page shows when no offender matches the SID number
+NO_RESULTS_XPATH = (
+    "//*[contains(@class, 'noResults')"
+    " or contains(translate(normalize-space(text()), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'no offenders')"
+    " or contains(translate(normalize-space(text()), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'no records')"
+    " or contains(translate(normalize-space(text()), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'no results')]"
+)
+
+
+def result_wait_summary(fixed_sleep=2):
+    """Compare the time spent waiting for search results with the fixed sleep the lookups used to take."""
+    count, total = run_metrics.count("result_wait"), run_metrics.total("result_wait")
+    if not count:
+        return "Result waits: no searches submitted."
+    return (f"Result waits: {count} searches, average {total / count:.2f}s, total {total:.1f}s "
+            f"(a fixed {fixed_sleep}s sleep would have cost {fixed_sleep * count:.1f}s).")
 
-    # Write the DataFrame to a CSV file without index
-    try:
-        df.to_csv(file_path, index=False)
-        logging.info(f"Data successfully written to CSV: {file_path}")
-        print(f"Data successfully written to CSV: {file_path}")
-    except Exception as e:
-        logging.error(f"Error writing data to CSV: {e}")
-        print(f"Error writing data to CSV: {e}")
 
+# Bytes transferred and load time of the page currently shown, from the Navigation/Resource Timing APIs
+PAGE_TRANSFER_SCRIPT = """
+var nav = performance.getEntriesByType('navigation')[0];
+var bytes = nav ? nav.transferSize : 0;
+performance.getEntriesByType('resource').forEach(function (entry) { bytes += entry.transferSize; });
+var ms = nav ? (nav.loadEventEnd || nav.domContentLoadedEventEnd || nav.responseEnd) - nav.startTime : 0;
+return [bytes, ms];
+"""
 
 
-def init_webdriver():
+class PageLoadStats:
+    """Thread-safe tally of bytes and page-load milliseconds per lookup, for comparing browser profiles."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.count = 0
+            self.bytes = 0
+            self.ms = 0.0
+
+    def record(self, page_bytes, page_ms):
+        with self._lock:
+            self.count += 1
+            self.bytes += page_bytes
+            self.ms += page_ms
+
+    def summary(self, profile):
+        with self._lock:
+            if not self.count:
+                return f"Page loads ({profile} profile): no lookups measured."
+            return (f"Page loads ({profile} profile): {self.count} lookups, average "
+                    f"{self.bytes / self.count / 1024:.1f} KB and {self.ms / self.count:.0f} ms of page loading per lookup.")
+
+
+page_load_stats = PageLoadStats()
+
+
+def _measure_page(driver, totals):
+    try:
+        page_bytes, page_ms = driver.execute_script(PAGE_TRANSFER_SCRIPT)
+        totals[0] += page_bytes or 0
+        totals[1] += page_ms or 0
+    except WebDriverException as e:
+        logging.debug(f"Could not read page timing: {e}")
+
+
+def _search_outcome(doc_number):
+    # Expected condition that settles once the results show either the DOC link or "no results"
+    def condition(driver):
+        links = driver.find_elements(By.LINK_TEXT, doc_number)
+        if links and links[0].is_displayed() and links[0].is_enabled():
+            return "found", links[0]
+        if driver.find_elements(By.XPATH, NO_RESULTS_XPATH):
+            return "not_found", None
+        return False
+    return condition
+
+
+# Browser profiles selectable for init_webdriver
+PROFILE_DEFAULT = "default"
+PROFILE_LEAN = "lean"
+
+# Chrome switches for the lean profile: nothing a headless lookup needs runs in the background
+LEAN_CHROME_ARGUMENTS = [
+    "--blink-settings=imagesEnabled=false",
+    "--disable-background-networking",
+    "--disable-background-timer-throttling",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-extensions",
+    "--disable-features=Translate,MediaRouter,OptimizationHints",
+    "--disable-gpu",
+    "--disable-software-rasterizer",
+    "--disable-sync",
+    "--metrics-recording-only",
+    "--mute-audio",
+    "--no-first-run",
+]
+
+# Requests the lean profile blocks outright: images, fonts and media are never read
+LEAN_BLOCKED_URLS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.svg", "*.ico", "*.webp", "*.bmp",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.mp3", "*.mp4", "*.ogg", "*.wav", "*.webm",
+]
+
+
+def init_webdriver(offline=None, profile=PROFILE_DEFAULT, page_load_strategy=None):
+    """Launch headless Chrome; ``page_load_strategy`` overrides the profile's strategy when set."""
+    with run_metrics.span("driver_launch"):
+        return _init_webdriver(offline, profile, page_load_strategy)
+
+
+def _init_webdriver(offline, profile, page_load_strategy=None):
     options = webdriver.ChromeOptions()
     options.add_argument("--headless")  # This runs Chrome in headless mode
     options.add_experimental_option("detach", True)
     options.add_experimental_option("excludeSwitches", ["enable-automation"])
     options.add_experimental_option("useAutomationExtension", False)
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+
+    if profile == PROFILE_LEAN:
+        # Return from navigation once the DOM is ready instead of after every subresource
+        options.page_load_strategy = "eager"
+        for argument in LEAN_CHROME_ARGUMENTS:
+            options.add_argument(argument)
+        options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.default_content_setting_values.notifications": 2,
+        })
+    if page_load_strategy:
+        options.page_load_strategy = page_load_strategy
+
+    # The chromedriver path is resolved once per process and cached on disk
+    driver_path = resolve_chromedriver_path(offline=offline)
+    try:
+        driver = webdriver.Chrome(service=Service(driver_path), options=options)
+    except SessionNotCreatedException:
+        # A cached driver may no longer match an upgraded Chrome; resolve again once
+        if not invalidate_chromedriver_path():
+            raise
+        driver = webdriver.Chrome(service=Service(resolve_chromedriver_path(offline=offline)), options=options)
+
+    if profile == PROFILE_LEAN:
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": LEAN_BLOCKED_URLS})
+        except WebDriverException as e:
+            logging.error(f"Error blocking images, fonts and media for the lean profile: {e}")
     return driver
 
 
-def search_gdc(driver, doc_number, first_name, last_name):
-    driver.get("https://docpub.state.or.us/OOS/searchCriteria.jsf")
+# Cookie that carries the docpub session, and with it the disclaimer acceptance
+SESSION_COOKIE = "JSESSIONID"
 
-    # Wait for the page to load fully
-    WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+# WebDriver session ids that have already accepted the disclaimer
+_disclaimer_sessions = set()
+_disclaimer_lock = threading.Lock()
 
-    # Check for "Agree" button and click it if present
+
+def accept_disclaimer(driver):
+    with _disclaimer_lock:
+        accepted = driver.session_id in _disclaimer_sessions
+
+    if accepted and driver.get_cookie(SESSION_COOKIE) is not None:
+        # This session already agreed; only click if the disclaimer is showing right now
+        agree_buttons = driver.find_elements(By.ID, "disclaimerForm:btnAgree")
+        if agree_buttons:
+            agree_buttons[0].click()
+        return
+
+    # First lookup on this driver, or the session cookie was lost: wait for the disclaimer
     try:
         agree_button = WebDriverWait(driver, 5).until(
             EC.element_to_be_clickable((By.ID, "disclaimerForm:btnAgree"))
@@ -135,11 +397,43 @@ def search_gdc(driver, doc_number, first_name, last_name):
     except TimeoutException:
         pass  # No need to log the absence or presence of the 'Agree' button every time.
 
+    with _disclaimer_lock:
+        _disclaimer_sessions.add(driver.session_id)
+
+
+def search_gdc(driver, doc_number, first_name, last_name, base_url=DOCPUB_BASE_URL,
+               result_wait_timeout=RESULT_WAIT_TIMEOUT, measure_page_loads=False):
+    if not measure_page_loads:
+        return _search_gdc(driver, doc_number, first_name, last_name, base_url, result_wait_timeout, None)
+
+    # Sum bytes and load time over the search, results and detail pages of this lookup
+    totals = [0, 0.0]
+    try:
+        return _search_gdc(driver, doc_number, first_name, last_name, base_url, result_wait_timeout, totals)
+    finally:
+        page_load_stats.record(*totals)
+
+
+def _search_gdc(driver, doc_number, first_name, last_name, base_url, result_wait_timeout, page_totals):
+    # Pace page loads across all workers to the configured rate
+    run_metrics.record("rate_limit_wait", page_load_limiter.acquire())
+    with run_metrics.span("navigate"):
+        driver.get(f"{base_url}/searchCriteria.jsf")
+
+        # Wait for the page to load fully
+        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+    if page_totals is not None:
+        _measure_page(driver, page_totals)
+
+    # Check for "Agree" button and click it if present
+    with run_metrics.span("disclaimer"):
+        accept_disclaimer(driver)
+
     # Remove leading zeros from DOC number
     doc_number = str(int(doc_number))  # Convert to int and back to string to remove leading zeros
 
     # Proceed with searching by DOC number in the mainBodyForm:SidNumber field
-    try:
+    def submit_search(attempt):
         # Locate the SID Number input field by its ID
         sid_field = WebDriverWait(driver, 10).until(
             EC.visibility_of_element_located((By.ID, "mainBodyForm:SidNumber"))
@@ -147,52 +441,102 @@ def search_gdc(driver, doc_number, first_name, last_name):
         sid_field.clear()
         sid_field.send_keys(doc_number)
         sid_field.send_keys("\n")  # Press Enter to submit
-        time.sleep(2)
+
+    try:
+        with run_metrics.span("submit"):
+            retry_step(submit_search, "submit SID search")
     except TimeoutException:
         error_message = f"Error locating the SID Number input field for DOC number {doc_number}, Name: {first_name} {last_name}"
         logging.info(error_message)
         print(error_message)
         return None
 
-    # Click on the DOC number link, which would show the inmate details
+    # Wait for the results to settle instead of sleeping a fixed time
+    wait_start = time.monotonic()
     try:
-        doc_link = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.LINK_TEXT, doc_number))
-        )
-        doc_link.click()
+        outcome, doc_link = WebDriverWait(
+            driver, result_wait_timeout, ignored_exceptions=[StaleElementReferenceException]
+        ).until(_search_outcome(doc_number))
     except TimeoutException:
+        # Neither the DOC link nor "no results" showed up: retry the lookup rather than report the AIC as not found
+        raise TimeoutException(
+            f"Search results for DOC number {doc_number} did not settle within {result_wait_timeout}s")
+    finally:
+        waited = time.monotonic() - wait_start
+        run_metrics.record("result_wait", waited)
+        logging.debug(f"Waited {waited:.2f}s for search results for DOC number {doc_number}")
+
+    if page_totals is not None:
+        _measure_page(driver, page_totals)
+
+    # Click on the DOC number link, which would show the inmate details
+    if outcome == "not_found":
         error_message = f"Error finding AIC with DOC number: {doc_number}, Name: {first_name} {last_name}"
         logging.info(error_message)
         print(error_message)
         return None
 
+    def click_doc_link(attempt):
+        # A retry finds the link again in case the one we waited for went stale
+        link = doc_link if attempt == 0 else driver.find_element(By.LINK_TEXT, doc_number)
+        link.click()
+
+    with run_metrics.span("link_click"):
+        retry_step(click_doc_link, "click DOC number link")
+
     # Extract inmate details
-    return extract_inmate_details(driver)
+    with run_metrics.span("extract"):
+        details = extract_inmate_details(driver)
+    if page_totals is not None:
+        _measure_page(driver, page_totals)
+    return details
+
+# Reads the four detail fields plus every other leaf offensesForm field in one WebDriver call
+EXTRACT_DETAILS_SCRIPT = """
+function text(el) { return el ? el.innerText.trim() : null; }
+var location = document.evaluate(
+    "//a[@title='" + arguments[0] + "']", document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+).singleNodeValue;
+var extra = {};
+var form = document.getElementById('offensesForm');
+if (form) {
+    form.querySelectorAll('[id^="offensesForm:"]').forEach(function (el) {
+        if (!el.children.length && el.tagName !== 'INPUT') {
+            extra[el.id.substring('offensesForm:'.length)] = text(el);
+        }
+    });
+}
+return {
+    name: text(document.getElementById('offensesForm:name')),
+    location: text(location),
+    status: text(document.getElementById('offensesForm:status')),
+    releaseDate: text(document.getElementById('offensesForm:relDate')),
+    extra: extra
+};
+"""
 
 def extract_inmate_details(driver):
     try:
-        name = WebDriverWait(driver, 10).until(
+        # One wait for the detail form, then a single batched read of every field
+        WebDriverWait(driver, 10).until(
             EC.visibility_of_element_located((By.ID, "offensesForm:name"))
-        ).text
-
-        location = WebDriverWait(driver, 10).until(
-            EC.visibility_of_element_located((By.XPATH,
-                                              "//a[@title='The state institution or county where the offender is serving their sentence.']"))
-        ).text
+        )
+        fields = driver.execute_script(EXTRACT_DETAILS_SCRIPT, LOCATION_TITLE)
 
-        status = WebDriverWait(driver, 10).until(
-            EC.visibility_of_element_located((By.ID, "offensesForm:status"))
-        ).text
+        missing = [key for key in ("name", "location", "status", "releaseDate") if fields.get(key) is None]
+        if missing:
+            raise NoSuchElementException(f"offensesForm fields not found: {', '.join(missing)}")
 
-        release_date = WebDriverWait(driver, 10).until(
-            EC.visibility_of_element_located((By.ID, "offensesForm:relDate"))
-        ).text
+        extra = fields.get("extra") or {}
+        for key in ("name", "status", "relDate"):
+            extra.pop(key, None)
 
         return {
-            "Name": name,
-            "Location": location,
-            "Status": status,
-            "Release Date": release_date
+            "Name": fields["name"],
+            "Location": fields["location"],
+            "Status": fields["status"],
+            "Release Date": fields["releaseDate"],
+            "Offense Fields": extra
         }
 
     except Exception as e:
@@ -200,13 +544,14 @@ def extract_inmate_details(driver):
         return None
 
 
-def process_individual(driver, doc_number, first_name, last_name, stop_flag):
+def process_individual(driver, doc_number, first_name, last_name, stop_flag, search=search_gdc):
     if stop_flag():
         logging.info("Stopping individual processing as requested.")
-        return None
+        raise LookupCancelled(doc_number)
 
-    # Call search_gdc with first name and last name
-    result = search_gdc(driver, doc_number, first_name, last_name)
+    # Call search_gdc (or the HTTP backend's equivalent) with first name and last name
+    with run_metrics.span("lookup_attempt"):
+        result = search(driver, doc_number, first_name, last_name)
     if result:
         # Add DOC number, first name, and last name to the result
         result["DOCNumber"] = doc_number
@@ -223,275 +568,508 @@ def process_individual(driver, doc_number, first_name, last_name, stop_flag):
         return None
 
 
-
-
-def process_with_retries(index, doc_number, first_name, last_name, stop_flag):
+def process_with_retries(index, doc_number, first_name, last_name, stop_flag, driver_pool, search=search_gdc,
+                         concurrency=None):
+    # One "lookup" sample per DOC number, however many attempts it took; a stopped lookup did not finish
+    start = time.perf_counter()
+    try:
+        return _lookup_with_retries(index, doc_number, first_name, last_name, stop_flag, driver_pool, search,
+                                    concurrency)
+    except LookupCancelled:
+        start = None
+        raise
+    finally:
+        if start is not None:
+            run_metrics.record("lookup", time.perf_counter() - start)
+
+
+def _lookup_with_retries(index, doc_number, first_name, last_name, stop_flag, driver_pool, search, concurrency):
+    # A stop is raised as LookupCancelled so the row is neither reported as not found nor journaled
     if stop_flag():
         logging.info("Stopping process with retries as requested.")
-        return index, None
+        raise LookupCancelled(doc_number)
 
     retries = 3
+    last_error = None
     for attempt in range(retries):
         if stop_flag():
             logging.info("Stopping WebDriver initialization as requested.")
-            return index, None
+            raise LookupCancelled(doc_number)
 
-        driver = init_webdriver()
+        # Borrow a long-lived driver from the pool instead of launching Chrome per row
+        driver = driver_pool.checkout()
+        healthy = True
         try:
-            result = process_individual(driver, doc_number, first_name, last_name, stop_flag)
+            result = process_individual(driver, doc_number, first_name, last_name, stop_flag, search=search)
             return index, result
-        except WebDriverException as e:
-            logging.error(f"WebDriver exception on attempt {attempt + 1} for DOC number {doc_number} ({first_name} {last_name}): {e}")
-            time.sleep(1)
+        except (WebDriverException, requests.RequestException, Urllib3HTTPError) as e:
+            # Only a lost session recycles the browser; page-level errors retry on the same driver
+            fatal = is_fatal_session_error(e)
+            healthy = not fatal
+            last_error = e
+            kind = "Fatal session" if fatal else "Transient"
+            logging.error(f"{kind} error on attempt {attempt + 1} for DOC number {doc_number} ({first_name} {last_name}): {e}")
+            if concurrency is not None:
+                concurrency.record_error(timed_out=isinstance(e, (TimeoutException, requests.Timeout)))
+            if attempt + 1 < retries and sleep_unless_stopped(stop_flag, backoff_delay(attempt)):
+                raise LookupCancelled(doc_number)
         finally:
-            driver.quit()
+            driver_pool.checkin(driver, healthy=healthy)
 
+    # Out of attempts: surface the error so the row is counted as failed rather than not found
+    if last_error is not None:
+        raise last_error
     return index, None
 
 
+def build_lookup_backend(backend, base_url=DOCPUB_BASE_URL, offline=None, result_wait_timeout=RESULT_WAIT_TIMEOUT,
+                         tabs_per_browser=None, browser_profile=PROFILE_DEFAULT, measure_page_loads=False):
+    """
+    Return the ``(driver_pool, search)`` pair that performs lookups for a backend.
 
-def update_csv(file_path, data, original_columns):
-    if not data:
-        logging.info("No data to write to CSV.")
-        print("No data to write to CSV.")
-        return
+    With ``tabs_per_browser`` set, Selenium workers get a tab each in shared browsers instead of a browser each.
+    """
+    if backend == BACKEND_HTTP:
+        # Pooled HTTP sessions instead of Chrome processes
+        driver_pool = DriverPool(lambda: HttpLookupSession(base_url), health_check=lambda session: True)
+        return driver_pool, search_gdc_http
 
-    # Create a DataFrame using the original columns to maintain consistency
-    df = pd.DataFrame(data)
+    if tabs_per_browser:
+        # Tabs wait for their own page loads so a navigating tab does not hold up the others
+        driver_pool = TabPool(lambda: init_webdriver(offline=offline, profile=browser_profile,
+                                                     page_load_strategy=TAB_PAGE_LOAD_STRATEGY),
+                              tabs_per_browser=tabs_per_browser)
+    else:
+        driver_pool = DriverPool(lambda: init_webdriver(offline=offline, profile=browser_profile))
+    return driver_pool, partial(search_gdc, base_url=base_url, result_wait_timeout=result_wait_timeout,
+                                measure_page_loads=measure_page_loads)
 
-    # Reorder columns to match the original input CSV, adding missing columns as blank if necessary
-    for column in original_columns:
-        if column not in df.columns:
-            df[column] = ""  # Add missing columns as empty
-    df = df[original_columns]
 
-    # Write the CSV without an index
-    try:
-        df.to_csv(file_path, index=False)
-        logging.info(f"Data successfully written to {file_path} with {len(data)} rows.")
-        print(f"Data successfully written to {file_path} with {len(data)} rows.")
-    except Exception as e:
-        logging.error(f"Error writing data to CSV: {e}")
-        print(f"Error writing data to CSV: {e}")
+# Lookup backend of a worker process in multi-process mode, set up by _init_shard_process
+_shard_driver_pool = None
+_shard_search = None
+_shard_stop_event = None
+# Failed attempts in this worker process, sent to the coordinator's concurrency controller with each result
+_shard_errors = ErrorTally()
 
 
+def _init_shard_process(backend, base_url, offline, result_wait_timeout, tabs_per_browser, browser_profile,
+                        rate_limit, rate_burst, processes, stop_event):
+    global _shard_driver_pool, _shard_search, _shard_stop_event
 
-import os
-import time
-import logging
-import pandas as pd
-from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
-
-def run_main_process(input_file, output_file, stop_flag):
-    start_time = time.time()
-    data = load_file(input_file)  # Use load_file to load CSV or Excel
-    if data is None or data.empty:
-        print("Failed to load data from file.")
-        return
-
-    # Clean column names by stripping whitespace and converting to consistent case
-    data.columns = data.columns.str.strip().str.lower()
-
-    # Rename columns to match expected names if they are different in input
-    column_rename_map = {
-        'last name': 'lastname',
-        'fist name': 'firstname',
-        'doc number': 'docnumber',
-        'previous location': 'previouslocation',
-        'current': 'current',
-        'out?': 'out',
-        'street': 'street',
-        'city': 'city',
-        'state': 'state',
-        'zip': 'zip',
-        'date of search': 'date of search',
-        'initials': 'initials',
-        'phone': 'phone',
-        'notes': 'notes'
-    }
-    data.rename(columns=column_rename_map, inplace=True)
-
-    if 'docnumber' not in data.columns:
-        print("Error: 'DOCNumber' column not found in input file.")
-        return
+    _shard_driver_pool, _shard_search = build_lookup_backend(backend, base_url, offline, result_wait_timeout,
+                                                             tabs_per_browser, browser_profile)
+    _shard_stop_event = stop_event
 
-    # Ensure DOCNumber is properly formatted, handle NaN values
-    data['docnumber'] = data['docnumber'].apply(
-        lambda x: str(int(float(x))).zfill(8) if pd.notna(x) and x != "" else "MISSING")
+    # Split the overall rate between the processes so together they keep to it
+    if rate_limit:
+        page_load_limiter.configure(rate_limit / processes, max(1, rate_burst // processes))
+    else:
+        page_load_limiter.configure(None)
 
-    # Get current date for logging purposes
-    current_date = datetime.now().strftime('%Y-%m-%d')
+    # Quit this process's drivers when the pool shuts it down (atexit does not run in pool workers)
+    multiprocessing.util.Finalize(None, _shard_driver_pool.close_all, exitpriority=10)
 
-    # Ensure required columns are in the DataFrame
-    required_columns = ["location", "status", "release date", "date of search"]
-    for col in required_columns:
-        if col not in data.columns:
-            data[col] = "N/A"
+    # On a stop, wake rate-limited lookups and quit the drivers so in-flight waits end at once
+    threading.Thread(target=_stop_shard_on_event, args=(stop_event, _shard_driver_pool), daemon=True).start()
 
-    all_subscriber_data = data.copy()  # Create a copy of the original data to maintain consistency
 
-    processed_docs = set()  # Set to track DOCNumbers that have already been processed
-    submitted_docs = set()  # Set to track DOCNumbers that have already been submitted for processing
+def _stop_shard_on_event(stop_event, driver_pool):
+    stop_event.wait()
+    page_load_limiter.interrupt()
+    driver_pool.close_all()
 
-    with ThreadPoolExecutor(max_workers=3) as executor:
-        futures = []
-        for index, row in data.iterrows():
-            if stop_flag():
-                logging.info("Stop signal received before scheduling new tasks.")
-                break
 
-            doc_number = row['docnumber']
+def lookup_in_shard(index, doc_number, first_name, last_name):
+    """
+    Run one lookup in a worker process with that process's own drivers or HTTP sessions.
 
-            # Ensure we do not process or submit the same DOCNumber more than once
-            if doc_number in processed_docs or doc_number in submitted_docs or doc_number == "MISSING":
-                continue
+    Returns ``(index, result, stage_samples, (errors, timeouts))``; the samples are merged into the
+    coordinator's metrics and the failed attempt counts fed to its concurrency controller. When the
+    lookup raises, both carry over to the process's next result.
+    """
+    index, result = process_with_retries(index, doc_number, first_name, last_name, _shard_stop_event.is_set,
+                                         _shard_driver_pool, _shard_search, concurrency=_shard_errors)
+    return index, result, run_metrics.drain(), _shard_errors.drain()
 
-            submitted_docs.add(doc_number)
 
-            first_name = row['firstname']
-            last_name = row['lastname']
+class _PendingChunk:
+    """A roster chunk waiting for its lookups to finish before it is merged with their results and written."""
 
-            # Schedule the process_with_retries function to be run in parallel
-            futures.append(
-                executor.submit(process_with_retries, index, doc_number, first_name, last_name, stop_flag)
-            )
+    def __init__(self, chunk, lookup_mask):
+        """
+        :param chunk: the normalized roster chunk
+        :param lookup_mask: boolean Series of the rows that take a lookup result (every row with a DOC number)
+        """
+        self.chunk = chunk
+        self.lookup_mask = lookup_mask
+        self.outstanding = 0  # Lookups submitted and not yet recorded
+        self.scheduled = False  # Whether every lookup of the chunk has been submitted
 
-        for future in as_completed(futures):
-            if stop_flag():
-                logging.info("Stopping all processes as requested.")
-                break
+    @property
+    def ready(self):
+        return self.scheduled and self.outstanding == 0
 
-            try:
-                index, result = future.result()
-                doc_number = data.iloc[index]['docnumber']
-                if result:
-                    # If inmate is found, update the original row data with the new data
-                    processed_docs.add(doc_number)
-                    all_subscriber_data.at[index, "location"] = result["Location"]
-                    all_subscriber_data.at[index, "status"] = result["Status"]
-                    all_subscriber_data.at[index, "release date"] = result["Release Date"]
-                    all_subscriber_data.at[index, "date of search"] = current_date
-
-                    # Log success and indicate that data was updated
-                    logging.info(
-                        f"Processed AIC successfully and updated data: DOC number: {result['DOCNumber']}, Name: {result['Name']}")
-                    print(f"Processed AIC successfully and updated data: DOC number: {result['DOCNumber']}, Name: {result['Name']}")
-                else:
-                    # If inmate is not found, retain all original values and update "DATE of SEARCH"
-                    processed_docs.add(doc_number)
-                    all_subscriber_data.at[index, "date of search"] = current_date
-
-                    # Log not found, indicating no alteration of key data fields
-                    logging.info(
-                        f"Error finding AIC: DOC number: {doc_number}, Name: {data.iloc[index]['firstname']} {data.iloc[index]['lastname']}. Data retained as original.")
-                    print(
-                        f"Error finding AIC: DOC number: {doc_number}, Name: {data.iloc[index]['firstname']} {data.iloc[index]['lastname']}. Data retained as original.")
-            except Exception as e:
-                doc_number = data.iloc[index]['docnumber']
-                processed_docs.add(doc_number)
-                logging.error(
-                    f"Error in processing future result for DOC number {doc_number} ({data.iloc[index]['firstname']} {data.iloc[index]['lastname']}): {e}")
-
-                # Retain original data since processing failed due to an error
-                all_subscriber_data.at[index, "date of search"] = current_date
-
-                # Log the error
-                logging.info(
-                    f"Error processing AIC due to exception: DOC number: {doc_number}, Name: {data.iloc[index]['firstname']} {data.iloc[index]['lastname']}. Data retained as original.")
-                print(
-                    f"Error processing AIC due to exception: DOC number: {doc_number}, Name: {data.iloc[index]['firstname']} {data.iloc[index]['lastname']}. Data retained as original.")
 
-    # Always output to CSV as requested
-    if not all_subscriber_data.empty:
-        update_csv(output_file, all_subscriber_data, original_columns=data.columns)
-        print(f"Data successfully written to {output_file} with {len(all_subscriber_data)} rows.")
-        logging.info(f"Output file created: {os.path.abspath(output_file)}")  # Log full path of the created file
-        print(f"Output file created at: {os.path.abspath(output_file)}")  # Explicitly print full path of created file
-    else:
-        print("No data to write.")
+def run_main_process(input_file, output_file, stop_flag, offline=None, backend=BACKEND_SELENIUM,
+                     base_url=DOCPUB_BASE_URL, result_wait_timeout=RESULT_WAIT_TIMEOUT, use_cache=True,
+                     refresh_cache=False, cache_ttl_hours=DEFAULT_CACHE_TTL_HOURS, cache_path=DEFAULT_CACHE_PATH,
+                     resume=False, workers=MAX_WORKERS, max_workers=POLITE_MAX_WORKERS, adaptive_concurrency=True,
+                     rate_limit=DEFAULT_RATE_LIMIT, rate_burst=DEFAULT_RATE_BURST, processes=None,
+                     tabs_per_browser=None, browser_profile=PROFILE_DEFAULT, measure_page_loads=False,
+                     metrics_path=None, prometheus_path=None, progress_callback=None):
+    """
+    Look up every DOC number in the roster and write the updated roster to ``output_file``.
 
-    end_time = time.time()
-    elapsed_time = end_time - start_time
-    minutes, seconds = divmod(elapsed_time, 60)
-    print(f"Time to complete search: {int(minutes)} minutes and {int(seconds)} seconds.")
+    ``progress_callback``, if given, receives progress event dicts (see :class:`progress.RunProgress`)
+    from the thread that made progress, a few times a second and once more when the run ends.
+    """
+    start_time = time.time()
+    run_metrics.reset()
+    progress = RunProgress(progress_callback)
+    page_load_stats.reset()
 
+    # One limiter paces every worker's lookups; None disables it
+    page_load_limiter.configure(rate_limit, rate_burst)
 
-def update_csv(file_path, data, original_columns):
-    if data.empty:
-        logging.info("No data to write to CSV.")
-        print("No data to write to CSV.")
+    # The roster is read in batches so lookups start before a large file is fully parsed
+    preprocessing_timings = {"read": 0.0, "normalize": 0.0, "dedup": 0.0}
+    chunks = iter_roster_chunks(input_file, timings=preprocessing_timings)
+    try:
+        first_chunk = next(chunks, None)
+    except Exception:
+        first_chunk = None
+    if first_chunk is None or first_chunk.empty:
+        print("Failed to load data from file.")
         return
 
-    # Create a DataFrame using the original columns to maintain consistency
-    df = pd.DataFrame(data)
-
-    # Reorder columns to match the original input CSV, adding missing columns as blank if necessary
-    for column in original_columns:
-        if column not in df.columns:
-            df[column] = ""  # Add missing columns as empty
-    df = df[original_columns]
+    if 'docnumber' not in first_chunk.columns:
+        print("Error: 'DOCNumber' column not found in input file.")
+        return
 
-    # Write the CSV without an index
-    try:
-        df.to_csv(file_path, index=False)
-        logging.info(f"Data successfully written to {file_path} with {len(data)} rows.")
-        print(f"Data successfully written to {file_path} with {len(data)} rows.")
-    except Exception as e:
-        logging.error(f"Error writing data to CSV: {e}")
-        print(f"Error writing data to CSV: {e}")
+    print("Columns in roster after loading:", first_chunk.columns.tolist())
+    columns = first_chunk.columns.tolist()
 
+    # Get current date for logging purposes
+    current_date = datetime.now().strftime('%Y-%m-%d')
 
-def update_excel(file_path, data, original_columns):
-    print("Excel output is no longer supported. Please use CSV output and convert to Excel if needed.")
+    seen_docs = set()  # DOCNumbers already processed or submitted for processing
+    total_rows = 0
+    duplicate_rows = 0  # Rows that share the lookup of an earlier row with the same DOCNumber
 
+    if backend not in (BACKEND_HTTP, BACKEND_SELENIUM):
+        print(f"Unknown lookup backend: {backend}")
+        return
 
-def update_csv(file_path, data, original_columns):
-    if data.empty:
-        logging.info("No data to write to CSV.")
-        print("No data to write to CSV.")
+    if backend == BACKEND_SELENIUM:
+        # Resolve chromedriver up front so every worker (and worker process) reuses the same path
+        try:
+            resolve_chromedriver_path(offline=offline)
+        except Exception as e:
+            logging.error(f"Error resolving chromedriver: {e}")
+            print(f"Error resolving chromedriver: {e}")
+            return
+
+    if processes:
+        if processes > max_workers:
+            # Every process runs a lookup at a time, so more processes than the polite ceiling would overload docpub
+            logging.warning(f"Limiting {processes} worker processes to the polite maximum of {max_workers}.")
+            print(f"Limiting {processes} worker processes to the polite maximum of {max_workers}.")
+            processes = max_workers
+
+        # Each worker process owns its drivers or HTTP sessions; this process only coordinates
+        driver_pool, search = None, None
+        shard_stop_event = multiprocessing.Event()
+        executor = ProcessPoolExecutor(
+            max_workers=processes, initializer=_init_shard_process,
+            initargs=(backend, base_url, offline, result_wait_timeout, tabs_per_browser, browser_profile,
+                      rate_limit, rate_burst, processes, shard_stop_event))
+        workers = max_workers = processes
+    else:
+        driver_pool, search = build_lookup_backend(backend, base_url, offline, result_wait_timeout, tabs_per_browser,
+                                                   browser_profile, measure_page_loads)
+        shard_stop_event = None
+        executor = ThreadPoolExecutor(max_workers=max_workers if adaptive_concurrency else workers)
+
+    # Fresh cached results are filled in without touching the site
+    result_cache = None
+    if use_cache:
+        try:
+            result_cache = ResultCache(cache_path, ttl_hours=cache_ttl_hours)
+        except Exception as e:
+            logging.error(f"Error opening result cache, continuing without it: {e}")
+            print(f"Error opening result cache, continuing without it: {e}")
+
+    # Every finished lookup is journaled beside the output so an interrupted run can resume
+    journal = RunJournal(output_file)
+    journaled = journal.replay() if resume else {}
+    if resume:
+        print(f"Resuming run: {len(journaled)} DOC numbers already completed in {journal.path}")
+    try:
+        if not resume:
+            # A fresh run must not overwrite the only record of an interrupted one
+            kept_path = journal.set_aside()
+            if kept_path:
+                message = (f"Kept the journal of an earlier interrupted run as {kept_path}. To resume that run "
+                           f"instead, rename it back to {journal.path} and choose resume.")
+                logging.warning(message)
+                print(message)
+        journal.open(resume=resume)
+    except OSError as e:
+        logging.error(f"Error opening journal {journal.path}: {e}")
+        print(f"Error opening journal {journal.path}: {e}")
         return
 
-    # Create a DataFrame using the original columns to maintain consistency
-    df = pd.DataFrame(data)
+    # Output chunks stream to <output>.partial in roster order as their lookups complete
+    writer = StreamingCsvWriter(output_file, columns)
+    try:
+        writer.open()
+    except OSError as e:
+        logging.error(f"Error opening output file {writer.partial_path}: {e}")
+        print(f"Error opening output file {writer.partial_path}: {e}")
+        journal.close()
+        return
 
-    # Reorder columns to match the original input CSV, adding missing columns as blank if necessary
-    for column in original_columns:
-        if column not in df.columns:
-            df[column] = ""  # Add missing columns as empty
-    df = df[original_columns]
+    # Results are buffered by DOC number and merged into each chunk once, when the chunk is written
+    results = ResultColumns()
+    pending_chunks = deque()  # Chunks read but not written yet, in roster order
+    unscheduled_chunks = []  # A chunk read but not scheduled because of a stop
+
+    def write_ready_chunks():
+        while pending_chunks and pending_chunks[0].ready:
+            pending = pending_chunks.popleft()
+            results.merge_into(pending.chunk, pending.lookup_mask)
+            writer.write(pending.chunk)
+
+    def remaining_chunks():
+        # Rows whose lookups never finished keep their original values, but rows never scheduled still
+        # get any result their DOC number already has from earlier in the roster
+        while pending_chunks:
+            pending = pending_chunks.popleft()
+            results.merge_into(pending.chunk, pending.lookup_mask)
+            yield pending.chunk
+        for chunk in itertools.chain(unscheduled_chunks, chunks):
+            results.merge_into(chunk, chunk['docnumber'] != "MISSING")
+            yield chunk
+
+    future_positions = {}  # In-flight future -> (its pending chunk, doc number, first name, last name, submit time)
+
+    # Concurrency starts at `workers` and adapts to latency, errors and host headroom up to `max_workers`
+    concurrency = AdaptiveConcurrency(initial=workers, max_workers=max_workers) if adaptive_concurrency else None
+
+    def record_result(future):
+        pending, doc_number, first_name, last_name, submitted_at = future_positions.pop(future)
+        if concurrency is not None:
+            limit = concurrency.record(time.monotonic() - submitted_at)
+            if limit != scheduler.window and driver_pool is not None:
+                # Keep only as many browsers as lookups may now run at once; a drop quits the idle extras
+                driver_pool.resize(limit)
+            scheduler.window = limit
+        try:
+            _, result, *shard_report = future.result()
+            if shard_report:
+                stage_samples, (errors, timeouts) = shard_report
+                run_metrics.merge(stage_samples)
+                if concurrency is not None:
+                    concurrency.record_errors(errors, timeouts)
+            progress.record(OUTCOME_FOUND if result else OUTCOME_NOT_FOUND)
+            if result:
+                # If inmate is found, update the original row data with the new data
+                results.set(doc_number, result["Location"], result["Status"], result["Release Date"], current_date)
+                journal.append(doc_number, result, current_date)
+                if result_cache is not None:
+                    result_cache.put(doc_number, result)
+
+                # Log success and indicate that data was updated
+                logging.info(
+                    f"Processed AIC successfully and updated data: DOC number: {result['DOCNumber']}, Name: {result['Name']}")
+                print(f"Processed AIC successfully and updated data: DOC number: {result['DOCNumber']}, Name: {result['Name']}")
+            else:
+                # If inmate is not found, retain all original values and update "DATE of SEARCH"
+                results.set(doc_number, None, None, None, current_date)
+                journal.append(doc_number, None, current_date)
+
+                # Log not found, indicating no alteration of key data fields
+                logging.info(
+                    f"Error finding AIC: DOC number: {doc_number}, Name: {first_name} {last_name}. Data retained as original.")
+                print(
+                    f"Error finding AIC: DOC number: {doc_number}, Name: {first_name} {last_name}. Data retained as original.")
+        except LookupCancelled:
+            # Stopped before it finished; the row keeps its original values and stays unjournaled
+            logging.info(f"Lookup for DOC number {doc_number} cancelled by stop.")
+        except Exception as e:
+            logging.error(
+                f"Error in processing future result for DOC number {doc_number} ({first_name} {last_name}): {e}")
+
+            # Retain original data since processing failed due to an error
+            results.set(doc_number, None, None, None, current_date)
+            progress.record(OUTCOME_ERROR)
+
+            # Log the error
+            logging.info(
+                f"Error processing AIC due to exception: DOC number: {doc_number}, Name: {first_name} {last_name}. Data retained as original.")
+            print(
+                f"Error processing AIC due to exception: DOC number: {doc_number}, Name: {first_name} {last_name}. Data retained as original.")
+        pending.outstanding -= 1
+        write_ready_chunks()
+
+    # Only a small window of lookups is in flight; new work is fed in as results complete.
+    # With adaptive concurrency the window is the number of lookups allowed to run at once.
+    # Waits on the window give up within a fraction of a second of a stop.
+    if concurrency is not None:
+        scheduler = BoundedScheduler(executor, window=concurrency.limit, stop_flag=stop_flag)
+    else:
+        scheduler = BoundedScheduler(executor, window=workers * QUEUE_DEPTH_PER_WORKER, stop_flag=stop_flag)
 
-    # Write the CSV without an index
     try:
-        df.to_csv(file_path, index=False)
-        logging.info(f"Data successfully written to {file_path} with {len(data)} rows.")
-        print(f"Data successfully written to {file_path} with {len(data)} rows.")
-    except Exception as e:
-        logging.error(f"Error writing data to CSV: {e}")
-        print(f"Error writing data to CSV: {e}")
-
+        stopped = False
 
-def update_excel(file_path, data, original_columns):
-    if data.empty:
-        logging.info("No data to write to Excel.")
-        print("No data to write to Excel.")
-        return
+        for chunk in itertools.chain([first_chunk], chunks):
+            if stop_flag():
+                logging.info("Stop signal received before scheduling new tasks.")
+                unscheduled_chunks.append(chunk)
+                break
 
-    # Create a DataFrame using the original columns to maintain consistency
-    df = pd.DataFrame(data)
+            # Look up each DOCNumber once: only the first row of a DOC number not seen in an earlier
+            # chunk is submitted, and its result is fanned out to every row with that DOC number
+            stage_start = time.perf_counter()
+            docs = chunk['docnumber']
+            has_doc = docs != "MISSING"
+            is_new = has_doc & ~docs.duplicated() & ~docs.isin(seen_docs)
+            seen_docs.update(docs[is_new])
+            new_docs = int(is_new.sum())
+            duplicate_rows += int(has_doc.sum()) - new_docs
+            preprocessing_timings["dedup"] += time.perf_counter() - stage_start
+            progress.add_total(new_docs)
+            total_rows += len(chunk)
+
+            # Chunks are written in roster order, so a DOC number first seen in an earlier chunk
+            # already has its result by the time this chunk is merged
+            pending = _PendingChunk(chunk, has_doc)
+            pending_chunks.append(pending)
+
+            lookups = chunk.loc[is_new, ['docnumber', 'firstname', 'lastname']]
+            for index, doc_number, first_name, last_name in lookups.itertuples(name=None):
+                entry = journaled.get(doc_number)
+                if entry is not None:
+                    # Completed before the interruption; replay it instead of looking it up again
+                    if entry["found"]:
+                        results.set(doc_number, entry["location"], entry["status"], entry["release_date"], entry["date"])
+                    else:
+                        results.set(doc_number, None, None, None, entry["date"])
+                    progress.record(OUTCOME_FOUND if entry["found"] else OUTCOME_NOT_FOUND, looked_up=False)
+                    continue
+
+                cached = result_cache.get(doc_number) if result_cache is not None and not refresh_cache else None
+                if cached:
+                    results.set(doc_number, cached["Location"], cached["Status"], cached["Release Date"],
+                                cached["Fetched At"].strftime('%Y-%m-%d'))
+                    logging.info(f"Filled DOC number {doc_number} from result cache.")
+                    progress.record(OUTCOME_FOUND, looked_up=False)
+                    continue
+
+                # Wait for room in the window, recording the lookups that finished meanwhile
+                for future in scheduler.wait_for_slot():
+                    record_result(future)
+                if stop_flag():
+                    logging.info("Stop signal received before scheduling new tasks.")
+                    stopped = True
+                    break
+
+                # Schedule the process_with_retries function to be run in parallel
+                if processes:
+                    future = scheduler.submit(lookup_in_shard, index, doc_number, first_name, last_name)
+                else:
+                    future = scheduler.submit(process_with_retries, index, doc_number, first_name, last_name, stop_flag,
+                                              driver_pool, search, concurrency)
+                future_positions[future] = (pending, doc_number, first_name, last_name, time.monotonic())
+                pending.outstanding += 1
 
-    # Reorder columns to match the original input Excel, adding missing columns as blank if necessary
-    for column in original_columns:
-        if column not in df.columns:
-            df[column] = ""  # Add missing columns as empty
-    df = df[original_columns]
+            # Every lookup of the chunk is scheduled; it is written as soon as they have all finished
+            pending.scheduled = True
+            write_ready_chunks()
 
-    # Write the DataFrame to an Excel file without index
-    try:
-        df.to_excel(file_path, index=False, engine='xlsxwriter')
-        logging.info(f"Data successfully written to Excel: {file_path}")
-        print(f"Data successfully written to Excel: {file_path}")
-    except Exception as e:
-        logging.error(f"Error writing data to Excel: {e}")
-        print(f"Error writing data to Excel: {e}")
+            if stopped:
+                break
+        else:
+            progress.mark_roster_read()
+
+        for future in scheduler.drain():
+            record_result(future)
+    finally:
+        stopping = stop_flag()
+        if stopping:
+            # Cancel queued lookups, wake rate-limited ones and quit the browsers so in-flight waits end
+            # now; lookups still running are abandoned and their rows keep their original values
+            logging.info("Stopping all processes as requested.")
+            cancelled = scheduler.cancel_pending()
+            logging.info(f"Cancelled {cancelled} queued lookups.")
+            # Lookups that finished before the stop are kept in the output and the journal
+            for future in scheduler.take_finished():
+                record_result(future)
+            page_load_limiter.interrupt()
+            if shard_stop_event is not None:
+                shard_stop_event.set()
+        if driver_pool is not None:
+            # Shut down the long-lived browsers once every lookup has finished (or been stopped)
+            driver_pool.close_all()
+        executor.shutdown(wait=not stopping, cancel_futures=True)
+
+    # Always output to CSV as requested; rows never reached (e.g. after a stop) keep their original values
+    output_written = writer.finalize(remaining_chunks())
+    progress.finish()
+    if output_written:
+        logging.info(f"Output file created: {os.path.abspath(output_file)}")  # Log full path of the created file
+        print(f"Output file created at: {os.path.abspath(output_file)}")  # Explicitly print full path of created file
+    else:
+        # Usually the output file is open in another program (e.g. Excel on Windows) and cannot be replaced
+        message = (f"Could not create {os.path.abspath(output_file)}. The results written so far are in "
+                   f"{os.path.abspath(writer.partial_path)}; close any program using the output file and "
+                   f"rename it, or resume the run.")
+        logging.error(message)
+        print(message)
+
+    # Keep the journal after a stop or a failed write so the run can be resumed; a finished run no longer needs it
+    if stop_flag():
+        journal.close()
+        print(f"Run stopped. Completed lookups are saved in {journal.path}; choose resume to continue.")
+    elif not output_written:
+        journal.close()
+        print(f"Completed lookups are saved in {journal.path}; choose resume to write the output again.")
+    else:
+        journal.remove()
 
+    end_time = time.time()
+    elapsed_time = end_time - start_time
+    minutes, seconds = divmod(elapsed_time, 60)
+    print(f"Time to complete search: {int(minutes)} minutes and {int(seconds)} seconds.")
+    preprocessing_summary = (
+        f"Roster preprocessing for {total_rows} rows ({len(seen_docs)} unique DOC numbers, "
+        f"{duplicate_rows} duplicate rows sharing their lookups): "
+        f"read {preprocessing_timings['read']:.2f}s, normalize {preprocessing_timings['normalize']:.2f}s, "
+        f"dedup {preprocessing_timings['dedup']:.2f}s.")
+    logging.info(preprocessing_summary)
+    print(preprocessing_summary)
+    if concurrency is not None:
+        logging.info(concurrency.summary())
+        print(concurrency.summary())
+    for line in run_metrics.summary_lines():
+        logging.info(line)
+        print(line)
+    if backend == BACKEND_SELENIUM:
+        logging.info(result_wait_summary())
+        print(result_wait_summary())
+        if measure_page_loads and not processes:
+            logging.info(page_load_stats.summary(browser_profile))
+            print(page_load_stats.summary(browser_profile))
+    if result_cache is not None:
+        logging.info(result_cache.summary())
+        print(result_cache.summary())
+        result_cache.close()
+
+    # Stage timings go beside the output as JSON and in Prometheus text format for dashboards
+    metrics_path = metrics_path or output_file + ".metrics.json"
+    prometheus_path = prometheus_path or output_file + ".prom"
+    run_metrics.write_json(metrics_path)
+    run_metrics.write_prometheus(prometheus_path)
+    print(f"Run metrics written to {metrics_path} and {prometheus_path}")
@@ -0,0 +1,153 @@
+import json
+import logging
+import math
+import os
+import threading
+import time
+from array import array
+from contextlib import contextmanager
+
+# Stages in the order they happen during a lookup, for reports
+STAGE_ORDER = ["driver_launch", "rate_limit_wait", "navigate", "disclaimer", "submit", "result_wait", "link_click",
+               "extract", "lookup_attempt", "lookup"]
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of already sorted values."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class StageMetrics:
+    """
+    Thread-safe latency samples per lookup stage, plus the end-of-run report and exports.
+
+    Durations are kept as compact float arrays so a whole run's samples can be summarized into
+    p50/p95/p99 per stage. Worker processes hand their samples to the coordinator with
+    :meth:`drain` and :meth:`merge`.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._samples = {}
+            self.started = time.time()
+
+    def record(self, stage, seconds):
+        with self._lock:
+            samples = self._samples.get(stage)
+            if samples is None:
+                samples = self._samples[stage] = array("d")
+            samples.append(seconds)
+
+    @contextmanager
+    def span(self, stage):
+        """Time the enclosed block as one sample of ``stage``, whether or not it raises."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start)
+
+    def drain(self):
+        """Return and forget the samples recorded so far, as plain lists that pickle cheaply."""
+        with self._lock:
+            samples, self._samples = self._samples, {}
+        return {stage: values.tolist() for stage, values in samples.items()}
+
+    def merge(self, samples):
+        """Add samples drained from another process."""
+        with self._lock:
+            for stage, values in samples.items():
+                self._samples.setdefault(stage, array("d")).extend(values)
+
+    def count(self, stage):
+        with self._lock:
+            return len(self._samples.get(stage, ()))
+
+    def total(self, stage):
+        with self._lock:
+            return sum(self._samples.get(stage, ()))
+
+    def snapshot(self):
+        """Summary statistics per stage plus run throughput, as a JSON-ready dict."""
+        with self._lock:
+            samples = {stage: sorted(values) for stage, values in self._samples.items()}
+        elapsed = max(time.time() - self.started, 1e-9)
+
+        stages = {}
+        for stage in sorted(samples, key=lambda s: (STAGE_ORDER.index(s) if s in STAGE_ORDER else len(STAGE_ORDER), s)):
+            values = samples[stage]
+            stages[stage] = {
+                "count": len(values),
+                "sum": sum(values),
+                "p50": percentile(values, 0.50),
+                "p95": percentile(values, 0.95),
+                "p99": percentile(values, 0.99),
+                "max": values[-1] if values else 0.0,
+            }
+
+        lookups = len(samples.get("lookup", ()))
+        return {
+            "started": self.started,
+            "elapsed_seconds": elapsed,
+            "lookups": lookups,
+            "lookups_per_minute": lookups / (elapsed / 60),
+            "stages": stages,
+        }
+
+    def summary_lines(self):
+        snapshot = self.snapshot()
+        lines = [f"Lookups: {snapshot['lookups']} at {snapshot['lookups_per_minute']:.1f} per minute."]
+        for stage, stats in snapshot["stages"].items():
+            lines.append(f"  {stage:<16} n={stats['count']:<6} p50 {stats['p50']:.3f}s  p95 {stats['p95']:.3f}s  "
+                         f"p99 {stats['p99']:.3f}s  total {stats['sum']:.1f}s")
+        return lines
+
+    def write_json(self, path):
+        _write_atomically(path, json.dumps(self.snapshot(), indent=2))
+
+    def write_prometheus(self, path):
+        """Write the snapshot in Prometheus text format, e.g. for the node exporter textfile collector."""
+        snapshot = self.snapshot()
+        lines = [
+            "# HELP ojrc_stage_duration_seconds Duration of each lookup stage in the last run.",
+            "# TYPE ojrc_stage_duration_seconds summary",
+        ]
+        for stage, stats in snapshot["stages"].items():
+            for quantile, key in (("0.5", "p50"), ("0.95", "p95"), ("0.99", "p99")):
+                lines.append(f'ojrc_stage_duration_seconds{{stage="{stage}",quantile="{quantile}"}} {stats[key]:.6f}')
+            lines.append(f'ojrc_stage_duration_seconds_sum{{stage="{stage}"}} {stats["sum"]:.6f}')
+            lines.append(f'ojrc_stage_duration_seconds_count{{stage="{stage}"}} {stats["count"]}')
+        lines += [
+            "# HELP ojrc_lookups_per_minute Lookup throughput of the last run.",
+            "# TYPE ojrc_lookups_per_minute gauge",
+            f"ojrc_lookups_per_minute {snapshot['lookups_per_minute']:.6f}",
+            "# HELP ojrc_run_duration_seconds Wall-clock duration of the last run.",
+            "# TYPE ojrc_run_duration_seconds gauge",
+            f"ojrc_run_duration_seconds {snapshot['elapsed_seconds']:.6f}",
+            "# HELP ojrc_last_run_timestamp_seconds When the last run started.",
+            "# TYPE ojrc_last_run_timestamp_seconds gauge",
+            f"ojrc_last_run_timestamp_seconds {snapshot['started']:.0f}",
+        ]
+        _write_atomically(path, "\n".join(lines) + "\n")
+
+
+def _write_atomically(path, text):
+    # The node exporter may read the file at any moment, so never expose a half-written one
+    tmp_path = path + ".tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logging.error(f"Error writing metrics to {path}: {e}")
+
+
+# Process-wide metrics for the current run
+run_metrics = StageMetrics()
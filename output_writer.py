@@ -0,0 +1,120 @@
+import logging
+import os
+
+import pandas as pd
+
+# Roster columns a lookup result fills in
+RESULT_COLUMNS = ["location", "status", "release date", "date of search"]
+
+
+class ResultColumns:
+    """
+    Lookup results kept as a DataFrame indexed by DOC number, with one column per result column.
+
+    Results are buffered as they complete and added to the frame when a chunk is written:
+    :meth:`merge_into` maps the chunk's DOC numbers onto each result column, so duplicate rows
+    share one lookup. A DOC number that was not found has no location, so only its date of search
+    is filled in.
+    """
+
+    def __init__(self) -> None:
+        self._frame = pd.DataFrame(columns=RESULT_COLUMNS, dtype=object)
+        self._pending = {}  # Results recorded since the frame was last updated
+
+    def __len__(self):
+        return len(self._results())
+
+    def __contains__(self, doc_number):
+        return doc_number in self._results().index
+
+    def set(self, doc_number, location, status, release_date, date_of_search) -> None:
+        """Record the result for a DOC number; pass a location of None when it was not found."""
+        self._pending[doc_number] = (location, status, release_date, date_of_search)
+
+    def _results(self):
+        if self._pending:
+            latest = pd.DataFrame.from_dict(self._pending, orient="index", columns=RESULT_COLUMNS, dtype=object)
+            self._pending = {}
+            frame = pd.concat([self._frame, latest])
+            self._frame = frame[~frame.index.duplicated(keep="last")]
+        return self._frame
+
+    def merge_into(self, chunk, mask=None) -> None:
+        """
+        Fill the result columns of ``chunk`` in place from the buffered results.
+
+        :param chunk: roster chunk with a "docnumber" column and the RESULT_COLUMNS
+        :param mask: optional boolean Series selecting the rows that may be filled
+        """
+        results = self._results()
+        docs = chunk["docnumber"] if mask is None else chunk["docnumber"][mask]
+        if results.empty or docs.empty:
+            return
+
+        matched = docs.isin(results.index)
+        found = matched & docs.map(results["location"]).notna()
+        chunk.loc[matched[matched].index, "date of search"] = docs[matched].map(results["date of search"])
+        for column in ("location", "status", "release date"):
+            chunk.loc[found[found].index, column] = docs[found].map(results[column])
+
+
+class StreamingCsvWriter:
+    """
+    Streams output rows to ``<output_file>.partial`` in roster order while lookups complete.
+
+    The caller writes each roster chunk once all of its lookups are done, so the partial file
+    always holds a finished prefix of the output that staff can open mid-run. :meth:`finalize`
+    writes whatever is left and atomically replaces the output file, keeping the roster's columns
+    and row order.
+    """
+
+    def __init__(self, output_file: str, columns) -> None:
+        """
+        :param output_file: final CSV path
+        :param columns: output column order (the roster's columns)
+        """
+        self.output_file = output_file
+        self.partial_path = output_file + ".partial"
+        self.columns = list(columns)
+        self.rows_written = 0
+        self._file = None
+
+    def open(self):
+        self._file = open(self.partial_path, "w", encoding="utf-8", newline="")
+        pd.DataFrame(columns=self.columns).to_csv(self._file, index=False)
+        self._file.flush()
+
+    def write(self, chunk):
+        """Append a finished roster chunk (a DataFrame with at least ``columns``)."""
+        chunk.to_csv(self._file, columns=self.columns, header=False, index=False)
+        self._file.flush()
+        self.rows_written += len(chunk)
+
+    def finalize(self, remaining_chunks):
+        """
+        Write every remaining chunk and move the partial file over the output file.
+
+        :param remaining_chunks: iterable of the chunks not written yet, in roster order
+            (e.g. chunks still waiting on lookups or never read after a stop)
+        :returns: True if the output file was written
+        """
+        try:
+            for chunk in remaining_chunks:
+                self.write(chunk)
+
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+            self._file = None
+            os.replace(self.partial_path, self.output_file)
+        except Exception as e:
+            logging.error(f"Error writing data to CSV: {e}")
+            print(f"Error writing data to CSV: {e}")
+            if self._file is not None:
+                self._file.close()  # Release the partial file so it can be opened or renamed
+                self._file = None
+            return False
+
+        logging.info(f"Data successfully written to {self.output_file} with {self.rows_written} rows.")
+        print(f"Data successfully written to {self.output_file} with {self.rows_written} rows.")
+        return True
@@ -0,0 +1,114 @@
+import threading
+import time
+from collections import deque
+
+# Outcomes a DOC number can finish with
+OUTCOME_FOUND = "found"
+OUTCOME_NOT_FOUND = "not_found"
+OUTCOME_ERROR = "error"
+
+# Lookups per minute is measured over this many recent seconds
+RATE_WINDOW_SECONDS = 60
+
+
+class RunProgress:
+    """
+    Thread-safe progress counters for a run, published as event dicts to a callback.
+
+    Events carry ``total`` (unique DOC numbers read so far), ``completed``, ``found``,
+    ``not_found``, ``errors``, ``lookups_per_minute``, ``eta_seconds`` (None until there is a
+    rate to go by), ``elapsed_seconds``, ``roster_read`` and ``finished``. Events are published
+    at most every ``min_interval`` seconds, except for the final one.
+    """
+
+    def __init__(self, callback=None, min_interval: float = 0.25) -> None:
+        """
+        :param callback: called with each event dict, from whichever thread made progress
+        :param min_interval: least number of seconds between published events
+        """
+        self.callback = callback
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self._published = 0.0
+        self._lookup_times = deque()
+        self.total = 0
+        self.counts = {OUTCOME_FOUND: 0, OUTCOME_NOT_FOUND: 0, OUTCOME_ERROR: 0}
+        self.roster_read = False
+        self.finished = False
+
+    def add_total(self, count: int) -> None:
+        """Add unique DOC numbers from a newly read part of the roster."""
+        with self._lock:
+            self.total += count
+        self._publish()
+
+    def mark_roster_read(self) -> None:
+        with self._lock:
+            self.roster_read = True
+        self._publish()
+
+    def record(self, outcome: str, looked_up: bool = True) -> None:
+        """
+        Count a finished DOC number.
+
+        :param outcome: OUTCOME_FOUND, OUTCOME_NOT_FOUND or OUTCOME_ERROR
+        :param looked_up: False for results filled from the cache or journal, which do not count towards the rate
+        """
+        with self._lock:
+            self.counts[outcome] += 1
+            if looked_up:
+                self._lookup_times.append(time.monotonic())
+        self._publish()
+
+    def finish(self) -> None:
+        with self._lock:
+            self.finished = True
+        self._publish(force=True)
+
+    def snapshot(self):
+        with self._lock:
+            now = time.monotonic()
+            while self._lookup_times and now - self._lookup_times[0] > RATE_WINDOW_SECONDS:
+                self._lookup_times.popleft()
+
+            elapsed = now - self._started
+            window = min(elapsed, RATE_WINDOW_SECONDS)
+            rate = len(self._lookup_times) / (window / 60) if window > 0 else 0.0
+            completed = sum(self.counts.values())
+            remaining = max(self.total - completed, 0)
+            return {
+                "total": self.total,
+                "completed": completed,
+                "found": self.counts[OUTCOME_FOUND],
+                "not_found": self.counts[OUTCOME_NOT_FOUND],
+                "errors": self.counts[OUTCOME_ERROR],
+                "lookups_per_minute": rate,
+                "eta_seconds": remaining / rate * 60 if rate > 0 else None,
+                "elapsed_seconds": elapsed,
+                "roster_read": self.roster_read,
+                "finished": self.finished,
+            }
+
+    def _publish(self, force=False):
+        if self.callback is None:
+            return
+        with self._lock:
+            now = time.monotonic()
+            if not force and now - self._published < self.min_interval:
+                return
+            self._published = now
+        self.callback(self.snapshot())
+
+
+def format_progress(event):
+    """One-line summary of a progress event for logs and the GUI."""
+    total = f"{event['total']}" if event["roster_read"] else f"{event['total']}+"
+    line = (f"Completed {event['completed']}/{total} (found {event['found']}, not found {event['not_found']}, "
+            f"errors {event['errors']}) | {event['lookups_per_minute']:.1f} lookups/min")
+    if event["finished"]:
+        return line + " | done"
+    if event["eta_seconds"] is not None:
+        minutes, seconds = divmod(int(event["eta_seconds"]), 60)
+        line += f" | ETA {minutes}m {seconds:02d}s"
+    return line
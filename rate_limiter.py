@@ -0,0 +1,59 @@
+import threading
+import time
+
+from exceptions import LookupCancelled
+
+# Default pace of lookups against docpub, and how many may start back to back after an idle spell
+DEFAULT_RATE_LIMIT = 2.0
+DEFAULT_RATE_BURST = 5
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket shared by every lookup worker in the process.
+
+    Tokens refill continuously at ``rate`` per second up to ``burst``. :meth:`acquire` takes one
+    token, sleeping until one is available, so the process as a whole never starts more than
+    ``rate`` page loads per second on average. A ``rate`` of None disables limiting.
+    :meth:`interrupt` wakes every waiting worker when the run is stopped.
+    """
+
+    def __init__(self, rate=DEFAULT_RATE_LIMIT, burst=DEFAULT_RATE_BURST) -> None:
+        self._lock = threading.Lock()
+        self._interrupted = threading.Event()
+        self.configure(rate, burst)
+
+    def configure(self, rate, burst=DEFAULT_RATE_BURST) -> None:
+        with self._lock:
+            self.rate = rate if rate and rate > 0 else None
+            self.burst = max(1, burst)
+            self._tokens = float(self.burst)
+            self._updated = time.monotonic()
+        self._interrupted.clear()
+
+    def interrupt(self) -> None:
+        """Make waiting and future :meth:`acquire` calls raise LookupCancelled until reconfigured."""
+        self._interrupted.set()
+
+    def acquire(self) -> float:
+        """Take one token, blocking until it is available. Returns the seconds spent waiting."""
+        waited = 0.0
+        while True:
+            if self._interrupted.is_set():
+                raise LookupCancelled("Rate limiter interrupted by a stop.")
+            with self._lock:
+                if self.rate is None:
+                    return waited
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            self._interrupted.wait(delay)
+            waited += delay
+
+
+# Process-wide limiter pacing docpub search page loads across all workers
+page_load_limiter = TokenBucket()
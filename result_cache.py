@@ -0,0 +1,87 @@
+import logging
+import os
+import sqlite3
+from datetime import datetime, timedelta
+
+# Local cache of lookup results, next to the chromedriver manifest
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".ojrc", "results_cache.sqlite3")
+
+# How long a cached lookup is considered fresh
+DEFAULT_CACHE_TTL_HOURS = 72
+
+
+class ResultCache:
+    """
+    On-disk SQLite cache of found lookups keyed by normalized (8 digit) DOC number.
+
+    Only lookups that found an AIC are cached; a row is served from the cache while it is younger
+    than ``ttl_hours``. Hit and miss counts are kept for the end-of-run report.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl_hours: float = DEFAULT_CACHE_TTL_HOURS) -> None:
+        """
+        :param path: SQLite database file, created if missing
+        :param ttl_hours: freshness window in hours
+        """
+        self.path = path
+        self.ttl = timedelta(hours=ttl_hours)
+        self.hits = 0
+        self.misses = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " doc_number TEXT PRIMARY KEY,"
+            " location TEXT,"
+            " status TEXT,"
+            " release_date TEXT,"
+            " fetched_at TEXT NOT NULL)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def normalize(doc_number):
+        return str(doc_number).strip().zfill(8)
+
+    def get(self, doc_number):
+        """Return the cached result for a DOC number, or None if it is missing or stale."""
+        row = self._conn.execute(
+            "SELECT location, status, release_date, fetched_at FROM results WHERE doc_number = ?",
+            (self.normalize(doc_number),)
+        ).fetchone()
+
+        if row is not None:
+            fetched_at = datetime.fromisoformat(row[3])
+            if datetime.now() - fetched_at <= self.ttl:
+                self.hits += 1
+                return {
+                    "Location": row[0],
+                    "Status": row[1],
+                    "Release Date": row[2],
+                    "Fetched At": fetched_at
+                }
+
+        self.misses += 1
+        return None
+
+    def put(self, doc_number, result):
+        """Store a found lookup, replacing any older entry for the DOC number."""
+        try:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (doc_number, location, status, release_date, fetched_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (self.normalize(doc_number), result["Location"], result["Status"], result["Release Date"],
+                 datetime.now().isoformat(timespec="seconds"))
+            )
+            self._conn.commit()
+        except sqlite3.Error as e:
+            logging.error(f"Error writing DOC number {doc_number} to result cache: {e}")
+
+    def summary(self):
+        return f"Result cache: {self.hits} hits, {self.misses} misses."
+
+    def close(self):
+        self._conn.close()
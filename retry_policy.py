@@ -0,0 +1,61 @@
+import logging
+import random
+import time
+
+import requests
+from selenium.common.exceptions import (ElementClickInterceptedException, ElementNotInteractableException,
+                                        InvalidSessionIdException, NoSuchWindowException,
+                                        SessionNotCreatedException, StaleElementReferenceException)
+from urllib3.exceptions import HTTPError as Urllib3HTTPError
+
+# Messages chromedriver uses when the browser or its session is gone for good
+FATAL_SESSION_MESSAGES = (
+    "chrome not reachable",
+    "disconnected",
+    "invalid session id",
+    "no such session",
+    "session deleted",
+    "target window already closed",
+    "tab crashed",
+    "unable to receive message from renderer",
+)
+
+# Element hiccups worth retrying within a single step of a lookup
+STEP_RETRY_EXCEPTIONS = (StaleElementReferenceException, ElementClickInterceptedException,
+                         ElementNotInteractableException)
+
+
+def is_fatal_session_error(error):
+    """
+    True if an error means the driver or HTTP session must be replaced.
+
+    Lost browser sessions, a closed window, an unreachable chromedriver and dropped HTTP
+    connections are fatal. Everything else (stale elements, slow pages, timeouts, HTTP errors)
+    is a transient page-level error that can be retried on the same driver.
+    """
+    if isinstance(error, (InvalidSessionIdException, NoSuchWindowException, SessionNotCreatedException)):
+        return True
+    if isinstance(error, Urllib3HTTPError):
+        return True  # chromedriver itself stopped answering
+    if isinstance(error, requests.ConnectionError) and not isinstance(error, requests.Timeout):
+        return True
+    message = str(error).lower()
+    return any(text in message for text in FATAL_SESSION_MESSAGES)
+
+
+def backoff_delay(attempt, base=0.5, cap=8.0):
+    """Exponential backoff with jitter: a random delay between half and all of ``base * 2 ** attempt``."""
+    delay = min(cap, base * (2 ** attempt))
+    return random.uniform(delay / 2, delay)
+
+
+def retry_step(step, description, attempts=3, base_delay=0.25):
+    """Run one step of a lookup, retrying it in place on element hiccups with backoff and jitter."""
+    for attempt in range(attempts):
+        try:
+            return step(attempt)
+        except STEP_RETRY_EXCEPTIONS as e:
+            if attempt + 1 == attempts:
+                raise
+            logging.info(f"Retrying step '{description}' after {type(e).__name__} (attempt {attempt + 1})")
+            time.sleep(backoff_delay(attempt, base=base_delay))
@@ -0,0 +1,94 @@
+import json
+import logging
+import os
+import time
+
+
+class RunJournal:
+    """
+    Append-only, fsync'd record of completed lookups kept beside the output file.
+
+    Each line is one JSON entry for a DOC number whose lookup finished, found or not. A run that
+    crashes or is stopped can be resumed by replaying the journal and submitting only the DOC
+    numbers it does not mention. Lookups that failed with an error are not journaled so a resumed
+    run tries them again.
+    """
+
+    def __init__(self, output_file: str) -> None:
+        """
+        :param output_file: output CSV path; the journal lives at ``<output_file>.journal``
+        """
+        self.path = output_file + ".journal"
+        self._file = None
+
+    def replay(self):
+        """Return ``{doc_number: entry}`` for every complete entry in an existing journal."""
+        entries = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # A torn final line from a crash mid-write
+                    entries[entry["doc"]] = entry
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logging.error(f"Error reading journal {self.path}: {e}")
+        return entries
+
+    def set_aside(self):
+        """
+        Move a non-empty journal out of the way so a fresh run does not overwrite it.
+
+        :returns: the journal's new path, or None when there was no journal to keep
+        """
+        try:
+            if os.path.getsize(self.path) == 0:
+                return None
+        except FileNotFoundError:
+            return None
+        kept_path = f"{self.path}.{time.strftime('%Y%m%d-%H%M%S')}"
+        os.replace(self.path, kept_path)
+        return kept_path
+
+    def open(self, resume: bool = False):
+        """Open the journal for appending, starting it afresh unless resuming."""
+        self._file = open(self.path, "a" if resume else "w", encoding="utf-8")
+
+        # Terminate a torn final line so the next entry starts on a line of its own
+        if resume and self._file.tell() > 0:
+            with open(self.path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    self._file.write("\n")
+
+    def append(self, doc_number, result, date_of_search):
+        """Durably record one finished lookup. ``result`` is None when the AIC was not found."""
+        entry = {"doc": doc_number, "found": result is not None, "date": date_of_search}
+        if result is not None:
+            entry["location"] = result["Location"]
+            entry["status"] = result["Status"]
+            entry["release_date"] = result["Release Date"]
+        try:
+            self._file.write(json.dumps(entry) + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        except OSError as e:
+            logging.error(f"Error writing DOC number {doc_number} to journal: {e}")
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def remove(self):
+        """Delete the journal once the output file has been written in full."""
+        self.close()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logging.error(f"Error removing journal {self.path}: {e}")
@@ -0,0 +1,64 @@
+from concurrent.futures import FIRST_COMPLETED, wait
+
+
+class BoundedScheduler:
+    """
+    Keeps at most ``window`` lookups in flight on an executor.
+
+    The producer calls :meth:`wait_for_slot` before each :meth:`submit`; it blocks while the
+    window is full and hands back the futures that completed in the meantime so the caller can
+    record them. Pending work, and the row data it captured, therefore never grows beyond the
+    window no matter how large the roster is. With a ``stop_flag`` both waits return within
+    ``poll_interval`` of a stop instead of waiting for a lookup to finish.
+    """
+
+    def __init__(self, executor, window: int, stop_flag=None, poll_interval: float = 0.2) -> None:
+        """
+        :param executor: executor the lookups run on
+        :param window: maximum number of submitted but unconsumed futures
+        :param stop_flag: optional callable; waits give up once it returns True
+        :param poll_interval: seconds between stop checks while waiting
+        """
+        self._executor = executor
+        self.window = max(1, window)
+        self._in_flight = set()
+        self._stop_flag = stop_flag
+        self._timeout = poll_interval if stop_flag is not None else None
+
+    def _stopped(self):
+        return self._stop_flag is not None and self._stop_flag()
+
+    @property
+    def in_flight(self):
+        return len(self._in_flight)
+
+    def submit(self, fn, *args, **kwargs):
+        future = self._executor.submit(fn, *args, **kwargs)
+        self._in_flight.add(future)
+        return future
+
+    def wait_for_slot(self):
+        """Block until fewer than ``window`` futures are in flight (or a stop); return the ones that completed."""
+        completed = []
+        while len(self._in_flight) >= self.window and not self._stopped():
+            done, self._in_flight = wait(self._in_flight, timeout=self._timeout, return_when=FIRST_COMPLETED)
+            completed.extend(done)
+        return completed
+
+    def drain(self):
+        """Yield the remaining in-flight futures as they complete, until none are left or a stop."""
+        while self._in_flight and not self._stopped():
+            done, self._in_flight = wait(self._in_flight, timeout=self._timeout, return_when=FIRST_COMPLETED)
+            yield from done
+
+    def take_finished(self):
+        """Remove and return the in-flight futures that have already finished, without waiting."""
+        finished = [future for future in self._in_flight if future.done() and not future.cancelled()]
+        self._in_flight.difference_update(finished)
+        return finished
+
+    def cancel_pending(self):
+        """Cancel futures that have not started yet; returns how many were cancelled."""
+        cancelled = [future for future in self._in_flight if future.cancel()]
+        self._in_flight.difference_update(cancelled)
+        return len(cancelled)
@@ -0,0 +1,88 @@
+import json
+
+import pytest
+from webdriver_manager import chrome
+
+import chromedriver_path
+
+
+class FakeChromeDriverManager:
+    installs = []
+
+    def install(self):
+        self.installs.append(1)
+        return FakeChromeDriverManager.path
+
+
+@pytest.fixture
+def manifest(tmp_path, monkeypatch):
+    # A fresh process state, a temporary manifest and no network
+    path = tmp_path / "chromedriver_manifest.json"
+    monkeypatch.setattr(chromedriver_path, "MANIFEST_PATH", str(path))
+    monkeypatch.setattr(chromedriver_path, "_resolved_path", None)
+    monkeypatch.setattr(chromedriver_path, "_resolved_from_manifest", False)
+    monkeypatch.delenv(chromedriver_path.OFFLINE_ENV, raising=False)
+    monkeypatch.delenv(chromedriver_path.PINNED_DRIVER_ENV, raising=False)
+    monkeypatch.setattr(chrome, "ChromeDriverManager", FakeChromeDriverManager)
+    FakeChromeDriverManager.installs = []
+    FakeChromeDriverManager.path = str(tmp_path / "downloaded" / "chromedriver")
+    return path
+
+
+def make_driver(path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("", encoding="utf-8")
+    return str(path)
+
+
+def test_a_driver_in_the_manifest_is_reused_without_webdriver_manager(manifest, tmp_path):
+    driver = make_driver(tmp_path / "cached" / "chromedriver")
+    manifest.write_text(json.dumps({"path": driver}), encoding="utf-8")
+
+    assert chromedriver_path.resolve_chromedriver_path() == driver
+    assert FakeChromeDriverManager.installs == []
+
+
+def test_a_missing_driver_is_resolved_once_and_saved(manifest):
+    manifest.write_text(json.dumps({"path": "/no/such/chromedriver"}), encoding="utf-8")
+
+    first = chromedriver_path.resolve_chromedriver_path()
+    second = chromedriver_path.resolve_chromedriver_path()
+
+    assert first == second == FakeChromeDriverManager.path
+    assert len(FakeChromeDriverManager.installs) == 1
+    assert json.loads(manifest.read_text(encoding="utf-8"))["path"] == FakeChromeDriverManager.path
+
+
+def test_offline_uses_the_pinned_driver(manifest, tmp_path, monkeypatch):
+    driver = make_driver(tmp_path / "pinned" / "chromedriver")
+    monkeypatch.setenv(chromedriver_path.OFFLINE_ENV, "1")
+    monkeypatch.setenv(chromedriver_path.PINNED_DRIVER_ENV, driver)
+
+    assert chromedriver_path.resolve_chromedriver_path() == driver
+    assert FakeChromeDriverManager.installs == []
+
+
+def test_offline_falls_back_to_the_manifests_pinned_entry(manifest, tmp_path):
+    driver = make_driver(tmp_path / "pinned" / "chromedriver")
+    manifest.write_text(json.dumps({"pinned": driver}), encoding="utf-8")
+
+    assert chromedriver_path.resolve_chromedriver_path(offline=True) == driver
+
+
+def test_offline_without_a_pinned_driver_fails(manifest):
+    with pytest.raises(FileNotFoundError):
+        chromedriver_path.resolve_chromedriver_path(offline=True)
+    assert FakeChromeDriverManager.installs == []
+
+
+def test_invalidating_a_manifest_driver_resolves_again(manifest, tmp_path):
+    driver = make_driver(tmp_path / "cached" / "chromedriver")
+    manifest.write_text(json.dumps({"path": driver, "pinned": "/pinned"}), encoding="utf-8")
+    chromedriver_path.resolve_chromedriver_path()
+
+    assert chromedriver_path.invalidate_chromedriver_path()
+    assert json.loads(manifest.read_text(encoding="utf-8")) == {"pinned": "/pinned"}
+    assert chromedriver_path.resolve_chromedriver_path() == FakeChromeDriverManager.path
+    # A driver webdriver_manager just resolved is not the manifest's to invalidate
+    assert not chromedriver_path.invalidate_chromedriver_path()
@@ -0,0 +1,76 @@
+import pytest
+
+import concurrency
+from concurrency import AdaptiveConcurrency
+
+
+@pytest.fixture(autouse=True)
+def idle_host(monkeypatch):
+    monkeypatch.setattr(concurrency, "host_headroom", lambda: (10.0, 10.0))
+
+
+def record_batch(controller, latency, count=10):
+    for _ in range(count):
+        limit = controller.record(latency)
+    return limit
+
+
+def test_limit_only_changes_once_a_sample_is_complete():
+    controller = AdaptiveConcurrency(initial=3)
+
+    assert record_batch(controller, 1.0, count=9) == 3
+    assert controller.record(1.0) == 4
+
+
+def test_healthy_lookups_add_one_worker_up_to_the_ceiling():
+    controller = AdaptiveConcurrency(initial=7, max_workers=8)
+
+    assert record_batch(controller, 1.0) == 8
+    assert record_batch(controller, 1.0) == 8
+
+
+def test_errors_halve_the_limit():
+    controller = AdaptiveConcurrency(initial=6)
+    for _ in range(3):
+        controller.record_error()
+    controller.record_error(timed_out=True)
+
+    assert record_batch(controller, 1.0) == 3
+
+
+def test_bulk_errors_from_worker_processes_count_too():
+    controller = AdaptiveConcurrency(initial=6)
+    controller.record_errors(2, 2)
+
+    assert record_batch(controller, 1.0) == 3
+
+
+def test_slowing_down_against_the_baseline_drops_one_worker():
+    controller = AdaptiveConcurrency(initial=4)
+    assert record_batch(controller, 1.0) == 5
+
+    assert record_batch(controller, 3.0) == 4
+
+
+def test_a_small_absolute_slowdown_is_not_slowing_down():
+    controller = AdaptiveConcurrency(initial=4)
+    record_batch(controller, 0.1)
+
+    assert record_batch(controller, 0.3) == 6
+
+
+def test_the_baseline_follows_a_lasting_slowdown():
+    controller = AdaptiveConcurrency(initial=4, max_workers=8)
+    record_batch(controller, 1.0)
+    limits = [record_batch(controller, 3.0) for _ in range(10)]
+
+    # Once the baseline has caught up, the slower site is the new normal and workers are added again
+    assert limits[-1] > min(limits)
+
+
+def test_a_busy_host_drops_one_worker(monkeypatch):
+    monkeypatch.setattr(concurrency, "host_headroom", lambda: (95.0, 10.0))
+    controller = AdaptiveConcurrency(initial=4, min_workers=3)
+
+    assert record_batch(controller, 1.0) == 3
+    assert record_batch(controller, 1.0) == 3
@@ -0,0 +1,104 @@
+import threading
+import time
+
+from driver_pool import TabPool
+
+PAGE_LOAD_SECONDS = 0.3
+
+
+class FakeSwitchTo:
+    def __init__(self, driver):
+        self._driver = driver
+
+    def window(self, handle):
+        self._driver.current_window_handle = handle
+
+    def new_window(self, kind):
+        handle = f"tab-{len(self._driver.window_handles)}"
+        self._driver.window_handles.append(handle)
+        self._driver.current_window_handle = handle
+
+
+class FakeChrome:
+    """A browser with page_load_strategy "none": get() returns at once and the page appears later."""
+
+    def __init__(self):
+        self.current_window_handle = "tab-0"
+        self.window_handles = ["tab-0"]
+        self.switch_to = FakeSwitchTo(self)
+        self.session_id = "fake"
+        self._loaded_at = {}
+        self._marked_at = {}
+
+    def get(self, url):
+        self._loaded_at[self.current_window_handle] = time.monotonic() + PAGE_LOAD_SECONDS
+
+    def execute_script(self, script, *args):
+        handle = self.current_window_handle
+        now = time.monotonic()
+        if "= true" in script:
+            self._marked_at[handle] = now
+            return None
+        if "readyState" in script:
+            # The marker belongs to the old document, which the new one replaces once loaded
+            loaded_at = self._loaded_at.get(handle, 0.0)
+            return now >= loaded_at and self._marked_at.get(handle, 0.0) < loaded_at
+        return 1
+
+    def quit(self):
+        pass
+
+
+def test_tab_get_waits_for_the_new_page():
+    pool = TabPool(FakeChrome, tabs_per_browser=2)
+    tab = pool.checkout()
+
+    start = time.monotonic()
+    tab.get("http://docpub.test/searchCriteria.jsf")
+
+    assert time.monotonic() - start >= PAGE_LOAD_SECONDS
+    pool.close_all()
+
+
+def test_tabs_of_one_browser_load_pages_concurrently():
+    pool = TabPool(FakeChrome, tabs_per_browser=4)
+    tabs = [pool.checkout() for _ in range(4)]
+    assert len({id(tab._browser) for tab in tabs}) == 1
+
+    threads = [threading.Thread(target=tab.get, args=("http://docpub.test/searchCriteria.jsf",)) for tab in tabs]
+    start = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # One page load's time, not four: no tab holds the browser while its page loads
+    assert time.monotonic() - start < 2 * PAGE_LOAD_SECONDS
+    pool.close_all()
+
+
+def test_pool_stays_usable_while_a_browser_launches():
+    launches = []
+
+    def slow_chrome():
+        launches.append(time.monotonic())
+        time.sleep(PAGE_LOAD_SECONDS)
+        return FakeChrome()
+
+    pool = TabPool(slow_chrome, tabs_per_browser=4)
+    tabs = []
+    threads = [threading.Thread(target=lambda: tabs.append(pool.checkout())) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    time.sleep(PAGE_LOAD_SECONDS / 3)
+
+    start = time.monotonic()
+    pool.resize(4)
+    assert time.monotonic() - start < PAGE_LOAD_SECONDS / 3
+
+    for thread in threads:
+        thread.join()
+    # Workers waiting on the launch take tabs in that browser instead of launching their own
+    assert len(launches) == 1
+    assert len({id(tab._browser) for tab in tabs}) == 1
+    pool.close_all()
@@ -0,0 +1,72 @@
+import pytest
+import requests
+
+import main
+from docpub_standin import start_standin
+from driver_pool import DriverPool
+from http_lookup import HttpLookupSession, search_gdc_http
+from rate_limiter import page_load_limiter
+
+
+@pytest.fixture
+def standin():
+    page_load_limiter.configure(None)
+    server, base_url = start_standin()
+    yield server, base_url
+    server.shutdown()
+
+
+@pytest.fixture
+def session_pool(standin):
+    _, base_url = standin
+    pool = DriverPool(lambda: HttpLookupSession(base_url), health_check=lambda session: True)
+    yield pool
+    pool.close_all()
+
+
+@pytest.fixture
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(main, "backoff_delay", lambda attempt: 0)
+
+
+def test_found_returns_the_detail_fields(standin):
+    _, base_url = standin
+    result = search_gdc_http(HttpLookupSession(base_url), "12345678", "John", "Doe")
+
+    assert result["Name"] == "DOE, JOHN"
+    assert result["Location"] == "Snake River Correctional Institution"
+    assert result["Status"] == "Inmate"
+    assert result["Release Date"] == "03/14/2027"
+
+
+def test_leading_zeros_are_dropped_from_the_sid(standin):
+    _, base_url = standin
+    result = search_gdc_http(HttpLookupSession(base_url), "01234567", "Jane", "Poe")
+
+    assert result["Location"] == "Coffee Creek Correctional Facility"
+
+
+def test_not_found_returns_none(standin):
+    _, base_url = standin
+    assert search_gdc_http(HttpLookupSession(base_url), "99999999", "No", "Body") is None
+
+
+def test_a_503_is_retried(standin, session_pool, no_backoff):
+    server, _ = standin
+    server.state.fail_next = 1
+
+    index, result = main.process_with_retries(7, "23456789", "Richard", "Roe", lambda: False, session_pool,
+                                              search_gdc_http)
+
+    assert index == 7
+    assert result["Location"] == "Oregon State Penitentiary"
+    assert server.state.injected_errors == 1
+
+
+def test_exhausted_retries_raise_the_last_error(standin, session_pool, no_backoff):
+    server, _ = standin
+    server.state.error_rate = 1.0
+
+    with pytest.raises(requests.HTTPError):
+        main.process_with_retries(0, "23456789", "Richard", "Roe", lambda: False, session_pool, search_gdc_http)
+    assert server.state.injected_errors == 3
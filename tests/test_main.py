@@ -0,0 +1,114 @@
+import time
+from datetime import datetime
+from functools import partial
+
+import pandas as pd
+import pytest
+
+import main
+from cancellation import CancellationToken
+from docpub_standin import start_standin
+from driver_pool import DriverPool
+
+
+def test_normalize_doc_numbers():
+    doc_numbers = pd.Series(["12345678", " 1234567 ", "42", "", None, "12-345", "123456789", "00012345"])
+
+    assert main.normalize_doc_numbers(doc_numbers).tolist() == [
+        "12345678", "01234567", "00000042", "MISSING", "MISSING", "MISSING", "123456789", "00012345"]
+
+
+ROSTER = """Last Name,Fist Name,DOC Number,Location,Status,Release Date,Date of Search
+Doe,John,12345678,,,,
+Poe,Jane,1234567,,,,
+Nobody,Ann,99999991,,,,
+Roe,Richard,23456789,,,,
+Doe,Johnny,12345678,,,,
+Missing,Max,,,,,
+Nobody,Bob,99999992,,,,
+Roe,Rick,23456789,,,,
+Nobody,Cy,99999993,,,,
+Poe,Janet,01234567,,,,
+"""
+
+
+@pytest.fixture
+def roster(tmp_path, monkeypatch):
+    # Small chunks so a stop leaves written, pending and unread chunks behind
+    monkeypatch.setattr(main, "iter_roster_chunks", partial(main.iter_roster_chunks, chunksize=3))
+    # Slow responses so the run is still going when the stop arrives
+    server, base_url = start_standin(latency=0.05)
+    path = tmp_path / "roster.csv"
+    path.write_text(ROSTER, encoding="utf-8")
+    yield path, partial(main.run_main_process, backend=main.BACKEND_HTTP, base_url=base_url, use_cache=False,
+                        workers=1, adaptive_concurrency=False, rate_limit=None)
+    server.shutdown()
+
+
+def test_stop_then_resume_matches_an_uninterrupted_run(roster, tmp_path):
+    roster_path, run = roster
+    reference = tmp_path / "reference.csv"
+    run(str(roster_path), str(reference), lambda: False)
+
+    output = tmp_path / "output.csv"
+    stop = CancellationToken()
+
+    def stop_after_two(event):
+        if event["completed"] >= 2:
+            stop.cancel()
+
+    run(str(roster_path), str(output), stop, progress_callback=stop_after_two)
+    journal = tmp_path / "output.csv.journal"
+    assert journal.exists()
+    assert len(journal.read_text(encoding="utf-8").splitlines()) < 6  # Six unique DOC numbers in the roster
+
+    run(str(roster_path), str(output), CancellationToken(), resume=True)
+
+    assert not journal.exists()
+    expected = pd.read_csv(reference, dtype=str)
+    assert pd.read_csv(output, dtype=str).equals(expected)
+    assert expected["location"].notna().sum() == 6
+
+
+def test_stop_keeps_lookups_that_already_finished(tmp_path, monkeypatch):
+    def search(driver, doc_number, first_name, last_name):
+        time.sleep(0.3 if doc_number == "12345678" else 0.5)
+        return {"Name": last_name, "Location": "Oregon State Penitentiary", "Status": "Inmate", "Release Date": ""}
+
+    monkeypatch.setattr(main, "build_lookup_backend", lambda *args, **kwargs: (
+        DriverPool(object, health_check=lambda driver: True), search))
+    roster_path = tmp_path / "roster.csv"
+    roster_path.write_text("Last Name,Fist Name,DOC Number\nA,A,12345678\nB,B,23456789\nC,C,34567890\nD,D,45678901\n",
+                           encoding="utf-8")
+    stop = CancellationToken()
+
+    def stop_after_first(event):
+        if event["completed"] >= 1 and not stop():
+            stop.cancel()
+            time.sleep(0.5)  # The other lookups finish while the first result is recorded
+
+    output = tmp_path / "output.csv"
+    main.run_main_process(str(roster_path), str(output), stop, backend=main.BACKEND_HTTP, use_cache=False,
+                          workers=4, adaptive_concurrency=False, rate_limit=None, progress_callback=stop_after_first)
+
+    assert pd.read_csv(output, dtype=str)["location"].notna().sum() == 4
+    assert len((tmp_path / "output.csv.journal").read_text(encoding="utf-8").splitlines()) == 4
+
+
+def test_excel_roster_skips_empty_rows_and_formats_dates(tmp_path):
+    openpyxl = pytest.importorskip("openpyxl")
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.append(["Last Name", "Fist Name", "DOC Number", "Date of Search"])
+    sheet.append(["Doe", "John", 12345678, datetime(2024, 1, 5)])
+    sheet.append([None, None, None, None])
+    sheet.append(["Roe", "Richard", 23456789, datetime(2024, 2, 1)])
+    sheet["B10"].number_format = "0.00"  # Formatted but empty, as left behind by editing in Excel
+    sheet["B10"].font = openpyxl.styles.Font(bold=True)
+    path = tmp_path / "roster.xlsx"
+    workbook.save(path)
+
+    roster = pd.concat(main.iter_roster_chunks(str(path)))
+
+    assert roster["docnumber"].tolist() == ["12345678", "23456789"]
+    assert roster["date of search"].tolist() == ["2024-01-05", "2024-02-01"]
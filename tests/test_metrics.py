@@ -0,0 +1,39 @@
+import pytest
+import requests
+
+import main
+from driver_pool import DriverPool
+from exceptions import LookupCancelled
+from metrics import run_metrics
+
+
+@pytest.fixture(autouse=True)
+def fresh_metrics(monkeypatch):
+    monkeypatch.setattr(main, "backoff_delay", lambda attempt: 0)
+    run_metrics.reset()
+
+
+def lookup(search):
+    pool = DriverPool(object, health_check=lambda driver: True)
+    return main.process_with_retries(0, "23456789", "Richard", "Roe", lambda: False, pool, search)
+
+
+def test_a_lookup_is_counted_once_however_many_attempts_it_took():
+    def failing_search(driver, doc_number, first_name, last_name):
+        raise requests.HTTPError("503 Server Error")
+
+    for _ in range(3):
+        with pytest.raises(requests.HTTPError):
+            lookup(failing_search)
+
+    snapshot = run_metrics.snapshot()
+    assert snapshot["lookups"] == 3
+    assert snapshot["stages"]["lookup_attempt"]["count"] == 9
+
+
+def test_a_stopped_lookup_is_not_counted():
+    pool = DriverPool(object, health_check=lambda driver: True)
+    with pytest.raises(LookupCancelled):
+        main.process_with_retries(0, "23456789", "Richard", "Roe", lambda: True, pool, lambda *args: None)
+
+    assert run_metrics.snapshot()["lookups"] == 0
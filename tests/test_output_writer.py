@@ -0,0 +1,50 @@
+import pandas as pd
+
+from output_writer import RESULT_COLUMNS, ResultColumns
+
+
+def roster_chunk(doc_numbers, start=0):
+    data = {"docnumber": doc_numbers}
+    data.update({column: ["old"] * len(doc_numbers) for column in RESULT_COLUMNS})
+    return pd.DataFrame(data, index=range(start, start + len(doc_numbers)))
+
+
+def test_merge_into_fills_duplicates_across_chunks():
+    results = ResultColumns()
+    results.set("23456789", "Oregon State Penitentiary", "Inmate", "11/02/2031", "2026-10-18")
+    results.set("99999999", None, None, None, "2026-10-18")
+
+    first = roster_chunk(["23456789", "99999999", "23456789"])
+    results.merge_into(first)
+    second = roster_chunk(["11111111", "23456789", "99999999"], start=3)
+    results.merge_into(second)
+
+    assert first["location"].tolist() == ["Oregon State Penitentiary", "old", "Oregon State Penitentiary"]
+    assert second["location"].tolist() == ["old", "Oregon State Penitentiary", "old"]
+    assert second["status"].tolist() == ["old", "Inmate", "old"]
+    # Not found keeps the row's values but records the search
+    assert second["date of search"].tolist() == ["old", "2026-10-18", "2026-10-18"]
+
+
+def test_merge_into_respects_the_mask():
+    results = ResultColumns()
+    results.set("23456789", "Oregon State Penitentiary", "Inmate", "11/02/2031", "2026-10-18")
+    chunk = roster_chunk(["23456789", "23456789"])
+
+    results.merge_into(chunk, pd.Series([False, True], index=chunk.index))
+
+    assert chunk["location"].tolist() == ["old", "Oregon State Penitentiary"]
+
+
+def test_a_later_result_replaces_the_earlier_one():
+    results = ResultColumns()
+    results.set("23456789", "Oregon State Penitentiary", "Inmate", "11/02/2031", "2026-10-17")
+    results.merge_into(roster_chunk(["23456789"]))
+    results.set("23456789", "Snake River Correctional Institution", "Inmate", "11/02/2031", "2026-10-18")
+
+    chunk = roster_chunk(["23456789"])
+    results.merge_into(chunk)
+
+    assert chunk["location"].tolist() == ["Snake River Correctional Institution"]
+    assert chunk["date of search"].tolist() == ["2026-10-18"]
+    assert len(results) == 1
@@ -0,0 +1,46 @@
+import threading
+import time
+
+import pytest
+
+from exceptions import LookupCancelled
+from rate_limiter import TokenBucket
+
+
+def test_a_burst_starts_at_once_then_tokens_follow_the_rate():
+    bucket = TokenBucket(rate=20, burst=3)
+
+    assert [bucket.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+    start = time.monotonic()
+    waited = bucket.acquire()
+
+    assert waited == pytest.approx(0.05, abs=0.02)
+    assert time.monotonic() - start >= 0.04
+
+
+def test_no_rate_means_no_waiting():
+    bucket = TokenBucket(rate=None, burst=1)
+
+    assert sum(bucket.acquire() for _ in range(100)) == 0.0
+
+
+def test_interrupt_wakes_a_waiting_acquire():
+    bucket = TokenBucket(rate=0.1, burst=1)
+    bucket.acquire()
+    threading.Timer(0.05, bucket.interrupt).start()
+
+    start = time.monotonic()
+    with pytest.raises(LookupCancelled):
+        bucket.acquire()
+    assert time.monotonic() - start < 1
+
+
+def test_configure_clears_an_interrupt():
+    bucket = TokenBucket(rate=None)
+    bucket.interrupt()
+    with pytest.raises(LookupCancelled):
+        bucket.acquire()
+
+    bucket.configure(None)
+
+    assert bucket.acquire() == 0.0
@@ -0,0 +1,49 @@
+from datetime import datetime, timedelta
+
+from result_cache import ResultCache
+
+FOUND = {"Location": "Oregon State Penitentiary", "Status": "Inmate", "Release Date": "11/02/2031"}
+
+
+def test_hits_and_misses_are_counted(tmp_path):
+    cache = ResultCache(str(tmp_path / "cache.sqlite3"))
+    cache.put("23456789", FOUND)
+
+    assert cache.get("23456789")["Location"] == "Oregon State Penitentiary"
+    assert cache.get(" 23456789 ")["Status"] == "Inmate"  # Keys are normalized DOC numbers
+    assert cache.get("99999999") is None
+    assert (cache.hits, cache.misses) == (2, 1)
+    assert cache.summary() == "Result cache: 2 hits, 1 misses."
+    cache.close()
+
+
+def test_short_doc_numbers_share_the_padded_key(tmp_path):
+    cache = ResultCache(str(tmp_path / "cache.sqlite3"))
+    cache.put("1234567", FOUND)
+
+    assert cache.get("01234567") is not None
+    cache.close()
+
+
+def test_entries_older_than_the_ttl_are_misses(tmp_path):
+    cache = ResultCache(str(tmp_path / "cache.sqlite3"), ttl_hours=72)
+    cache.put("23456789", FOUND)
+    cache.put("12345678", FOUND)
+    stale = (datetime.now() - timedelta(hours=73)).isoformat(timespec="seconds")
+    cache._conn.execute("UPDATE results SET fetched_at = ? WHERE doc_number = '23456789'", (stale,))
+
+    assert cache.get("23456789") is None
+    assert cache.get("12345678") is not None
+    assert (cache.hits, cache.misses) == (1, 1)
+    cache.close()
+
+
+def test_results_persist_between_runs(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = ResultCache(path)
+    cache.put("23456789", FOUND)
+    cache.close()
+
+    reopened = ResultCache(path)
+    assert reopened.get("23456789")["Release Date"] == "11/02/2031"
+    reopened.close()
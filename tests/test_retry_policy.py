@@ -0,0 +1,37 @@
+import pytest
+import requests
+from selenium.common.exceptions import (InvalidSessionIdException, NoSuchWindowException,
+                                        StaleElementReferenceException, TimeoutException, WebDriverException)
+from urllib3.exceptions import HTTPError as Urllib3HTTPError
+
+from retry_policy import backoff_delay, is_fatal_session_error
+
+
+@pytest.mark.parametrize("error", [
+    InvalidSessionIdException("invalid session id"),
+    NoSuchWindowException("no such window"),
+    WebDriverException("unknown error: chrome not reachable"),
+    WebDriverException("disconnected: not connected to DevTools"),
+    Urllib3HTTPError("connection refused"),
+    requests.ConnectionError("connection reset"),
+])
+def test_lost_sessions_are_fatal(error):
+    assert is_fatal_session_error(error)
+
+
+@pytest.mark.parametrize("error", [
+    StaleElementReferenceException("stale element reference"),
+    TimeoutException("results did not settle"),
+    requests.Timeout("read timed out"),
+    requests.HTTPError("503 Server Error"),
+])
+def test_page_level_errors_are_transient(error):
+    assert not is_fatal_session_error(error)
+
+
+@pytest.mark.parametrize("attempt, low, high", [(0, 0.25, 0.5), (1, 0.5, 1.0), (2, 1.0, 2.0), (10, 4.0, 8.0)])
+def test_backoff_doubles_with_jitter_up_to_the_cap(attempt, low, high):
+    delays = [backoff_delay(attempt) for _ in range(200)]
+
+    assert low <= min(delays) and max(delays) <= high
+    assert len(set(delays)) > 1
@@ -0,0 +1,57 @@
+from run_journal import RunJournal
+
+FOUND = {"Location": "Oregon State Penitentiary", "Status": "Inmate", "Release Date": "11/02/2031"}
+
+
+def test_replay_skips_a_torn_last_line(tmp_path):
+    journal = RunJournal(str(tmp_path / "output.csv"))
+    journal.open()
+    journal.append("23456789", FOUND, "2026-10-18")
+    journal.append("99999999", None, "2026-10-18")
+    journal.close()
+    with open(journal.path, "a", encoding="utf-8") as f:
+        f.write('{"doc": "12345678", "fou')
+
+    entries = journal.replay()
+
+    assert sorted(entries) == ["23456789", "99999999"]
+    assert entries["23456789"]["location"] == "Oregon State Penitentiary"
+    assert entries["99999999"]["found"] is False
+
+
+def test_resuming_after_a_torn_line_keeps_new_entries_readable(tmp_path):
+    journal = RunJournal(str(tmp_path / "output.csv"))
+    journal.open()
+    journal.append("23456789", FOUND, "2026-10-18")
+    journal.close()
+    with open(journal.path, "a", encoding="utf-8") as f:
+        f.write('{"doc": "12345678", "fou')
+
+    journal.open(resume=True)
+    journal.append("12345678", None, "2026-10-18")
+    journal.close()
+
+    assert sorted(journal.replay()) == ["12345678", "23456789"]
+
+
+def test_a_fresh_run_sets_an_interrupted_journal_aside(tmp_path):
+    journal = RunJournal(str(tmp_path / "output.csv"))
+    journal.open()
+    journal.append("23456789", FOUND, "2026-10-18")
+    journal.close()
+
+    kept_path = journal.set_aside()
+
+    assert not (tmp_path / "output.csv.journal").exists()
+    assert RunJournal(str(tmp_path / "output.csv")).replay() == {}
+    with open(kept_path, encoding="utf-8") as f:
+        assert "23456789" in f.read()
+
+
+def test_an_empty_or_missing_journal_is_not_kept(tmp_path):
+    journal = RunJournal(str(tmp_path / "output.csv"))
+    assert journal.set_aside() is None
+
+    journal.open()
+    journal.close()
+    assert journal.set_aside() is None
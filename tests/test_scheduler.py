@@ -0,0 +1,62 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from scheduler import BoundedScheduler
+
+
+@pytest.fixture
+def executor():
+    executor = ThreadPoolExecutor(max_workers=2)
+    yield executor
+    executor.shutdown(wait=True, cancel_futures=True)
+
+
+def test_wait_for_slot_keeps_the_window_and_returns_finished_futures(executor):
+    scheduler = BoundedScheduler(executor, window=2)
+    first = scheduler.submit(time.sleep, 0.05)
+    scheduler.submit(time.sleep, 0.5)
+
+    completed = scheduler.wait_for_slot()
+
+    assert completed == [first]
+    assert scheduler.in_flight == 1
+
+
+def test_drain_yields_every_remaining_future(executor):
+    scheduler = BoundedScheduler(executor, window=4)
+    futures = {scheduler.submit(lambda n=n: n) for n in range(4)}
+
+    assert set(scheduler.drain()) == futures
+    assert scheduler.in_flight == 0
+
+
+def test_waits_give_up_on_a_stop(executor):
+    stop = threading.Event()
+    scheduler = BoundedScheduler(executor, window=1, stop_flag=stop.is_set, poll_interval=0.05)
+    release = threading.Event()
+    scheduler.submit(release.wait)
+    threading.Timer(0.1, stop.set).start()
+
+    start = time.monotonic()
+    assert scheduler.wait_for_slot() == []
+    assert list(scheduler.drain()) == []
+    assert time.monotonic() - start < 0.5
+    release.set()
+
+
+def test_cancel_pending_only_cancels_queued_futures(executor):
+    scheduler = BoundedScheduler(executor, window=4)
+    release = threading.Event()
+    running = [scheduler.submit(release.wait) for _ in range(2)]
+    scheduler.submit(release.wait)
+    scheduler.submit(release.wait)
+    while not all(future.running() for future in running):
+        time.sleep(0.01)
+
+    assert scheduler.cancel_pending() == 2
+    assert scheduler.in_flight == 2
+    release.set()
+    assert all(future.result() for future in running)